@@ -8,18 +8,41 @@
 """
 
 import argparse
+import json
 import os
+import stat
 import subprocess
 import sys
+import threading
+from bisect import bisect_right
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from functools import lru_cache, partial
 from pathlib import Path
 from datetime import datetime
 
-try:
-    import whisper
-except ImportError:
-    print("Ошибка: библиотека whisper не установлена.")
-    print("Установите её командой: pip install openai-whisper")
-    sys.exit(1)
+# Соответствие значений --model идентификаторам моделей CTranslate2 (faster-whisper, whisperx)
+MODEL_IDS = {
+    'tiny': 'tiny',
+    'base': 'base',
+    'small': 'small',
+    'medium': 'medium',
+    'large': 'large-v3',
+}
+
+# Бэкенды распознавания речи и пакеты, которые они требуют
+BACKEND_PACKAGES = {
+    'faster_whisper': 'faster-whisper',
+    'whisperx': 'whisperx',
+    'transformers_compiled': 'transformers torch',
+    'openvino': 'optimum[openvino]',
+}
+
+# Загруженные модели по (бэкенд, имя, устройство): повторные вызовы в одном процессе не перечитывают веса с диска
+_MODEL_CACHE = {}
+
+# Сериализует вызовы модели при параллельной обработке файлов в потоках
+_TRANSCRIBE_LOCK = threading.Lock()
 
 
 # ---------------------------------------------------------------------------
@@ -27,73 +50,371 @@ except ImportError:
 # ---------------------------------------------------------------------------
 
 def get_whisper_cache_dir():
-    """Определяет путь к директории кэша Whisper."""
-    # Whisper использует XDG_CACHE_HOME или ~/.cache/whisper
+    """Определяет путь к директории кэша моделей (Hugging Face Hub)."""
+    # Все бэкенды хранят модели в кэше Hugging Face Hub:
+    # HF_HUB_CACHE, HF_HOME/hub, XDG_CACHE_HOME/huggingface/hub или ~/.cache/huggingface/hub
+    hub_cache = os.environ.get('HF_HUB_CACHE')
+    if hub_cache:
+        return Path(hub_cache)
+    hf_home = os.environ.get('HF_HOME')
+    if hf_home:
+        return Path(hf_home) / 'hub'
     cache_home = os.environ.get('XDG_CACHE_HOME')
     if cache_home:
-        return Path(cache_home) / 'whisper'
+        return Path(cache_home) / 'huggingface' / 'hub'
     else:
-        return Path.home() / '.cache' / 'whisper'
+        return Path.home() / '.cache' / 'huggingface' / 'hub'
 
 
 def check_model_in_cache(model_name):
     """
-    Проверяет наличие модели в локальном кэше.
-    Возвращает путь к файлу модели, если он существует, иначе None.
+    Проверяет наличие модели faster-whisper в локальном кэше.
+    Возвращает путь к директории модели, если она существует, иначе None.
     """
-    cache_dir = get_whisper_cache_dir()
-    
-    # Определяем имя файла модели
-    model_file = f"{model_name}.pt"
-    model_path = cache_dir / model_file
-    
-    if model_path.exists() and model_path.is_file():
-        return model_path
+    from faster_whisper.utils import download_model
+
+    model_id = MODEL_IDS.get(model_name, model_name)
+    try:
+        # local_files_only=True: только поиск в кэше, без сетевых запросов
+        model_path = Path(download_model(model_id, local_files_only=True))
+    except Exception:
+        return None
+
+    try:
+        if stat.S_ISDIR(model_path.stat().st_mode):
+            return model_path
+    except OSError:
+        pass
     return None
 
 
-def load_model_offline(model_name):
+def resolve_device(requested='auto'):
     """
-    Загружает модель Whisper из локального кэша (офлайн-режим).
-    Выдает ошибку, если модель не найдена в кэше.
+    Определяет устройство для распознавания: cuda, mps или cpu.
+    При 'auto' выбирается доступный ускоритель, иначе CPU.
+    """
+    if requested and requested != 'auto':
+        return requested
+    try:
+        import torch
+
+        if torch.cuda.is_available():
+            return 'cuda'
+        mps = getattr(torch.backends, 'mps', None)
+        if mps is not None and mps.is_available():
+            return 'mps'
+    except ImportError:
+        pass
+    try:
+        import ctranslate2
+
+        if ctranslate2.get_cuda_device_count() > 0:
+            return 'cuda'
+    except ImportError:
+        pass
+    return 'cpu'
+
+
+def _ct2_device(device):
+    """
+    Устройство и тип вычислений для CTranslate2: float16 на GPU, int8 на CPU.
+    CTranslate2 не поддерживает mps — в этом случае используется CPU.
     """
-    # Проверяем наличие модели в кэше
+    if device == 'cuda':
+        return 'cuda', 'float16'
+    if device == 'mps':
+        print("Предупреждение: бэкенд на CTranslate2 не поддерживает mps, используется CPU (int8).")
+    return 'cpu', 'int8'
+
+
+def _load_faster_whisper(model_name, device):
+    """faster-whisper: веса CTranslate2 (int8 на CPU, float16 на GPU)."""
+    from faster_whisper import WhisperModel
+
     model_path = check_model_in_cache(model_name)
-    
     if model_path is None:
-        cache_dir = get_whisper_cache_dir()
-        print(f"Ошибка: модель '{model_name}' не найдена в локальном кэше.")
-        print(f"Ожидаемый путь: {cache_dir / f'{model_name}.pt'}")
-        print("\nДля работы в офлайн-режиме необходимо предварительно загрузить модель.")
-        print("Запустите скрипт с интернет-соединением один раз, чтобы загрузить модель в кэш.")
-        print(f"Или загрузите модель вручную в директорию: {cache_dir}")
         return None
-    
     print(f"Модель '{model_name}' найдена в локальном кэше: {model_path}")
-    
-    # Загружаем модель из кэша
-    # whisper.load_model() автоматически использует кэш, если модель там есть
-    # Поскольку мы уже проверили наличие модели, она будет загружена из кэша без сетевых запросов
+    device, compute_type = _ct2_device(device)
+    # Загрузка по локальному пути — сетевых запросов нет
+    return WhisperModel(str(model_path), device=device, compute_type=compute_type)
+
+
+def _load_whisperx(model_name, device):
+    """whisperx: пакетное распознавание поверх CTranslate2."""
+    import whisperx
+
+    device, compute_type = _ct2_device(device)
+    return whisperx.load_model(
+        MODEL_IDS.get(model_name, model_name), device,
+        compute_type=compute_type, language='ru', local_files_only=True
+    )
+
+
+def _load_transformers_compiled(model_name, device):
+    """
+    transformers: статический KV-кэш и torch.compile для декодера.
+    Первый вызов компилирует граф, последующие работают заметно быстрее.
+    """
+    import torch
+    from transformers import AutoProcessor, WhisperForConditionalGeneration, pipeline
+
+    repo_id = f"openai/whisper-{MODEL_IDS.get(model_name, model_name)}"
+    # На GPU — половинная точность: вдвое меньше обращений к памяти
+    torch_dtype = torch.float16 if device in ('cuda', 'mps') else torch.float32
+    processor = AutoProcessor.from_pretrained(repo_id, local_files_only=True)
+    model = WhisperForConditionalGeneration.from_pretrained(
+        repo_id, torch_dtype=torch_dtype, local_files_only=True
+    ).to(device)
+    model.generation_config.cache_implementation = 'static'
+    model.forward = torch.compile(model.forward, mode='reduce-overhead', fullgraph=True)
+    return pipeline(
+        'automatic-speech-recognition',
+        model=model,
+        tokenizer=processor.tokenizer,
+        feature_extractor=processor.feature_extractor,
+        chunk_length_s=30,
+        torch_dtype=torch_dtype,
+        device=device,
+    )
+
+
+def _load_openvino(model_name, device):
+    """
+    OpenVINO: int8-веса для x86 CPU (инструкции VNNI).
+    Модель конвертируется в IR один раз и кэшируется в
+    get_whisper_cache_dir() / 'openvino' / model_name.
+    """
+    from optimum.intel.openvino import OVModelForSpeechSeq2Seq, OVWeightQuantizationConfig
+    from transformers import AutoProcessor, pipeline
+
+    if device != 'cpu':
+        print("Предупреждение: бэкенд openvino рассчитан на CPU, используется CPU.")
+    ir_dir = get_whisper_cache_dir() / 'openvino' / model_name
+    if (ir_dir / 'openvino_encoder_model.xml').is_file():
+        processor = AutoProcessor.from_pretrained(ir_dir, local_files_only=True)
+        model = OVModelForSpeechSeq2Seq.from_pretrained(ir_dir, local_files_only=True)
+    else:
+        # Первая загрузка: экспорт из закэшированной модели transformers с квантованием
+        # весов в int8 (без калибровочного датасета — он потребовал бы сеть)
+        repo_id = f"openai/whisper-{MODEL_IDS.get(model_name, model_name)}"
+        print(f"Конвертация модели '{model_name}' в OpenVINO IR (выполняется один раз)...")
+        processor = AutoProcessor.from_pretrained(repo_id, local_files_only=True)
+        model = OVModelForSpeechSeq2Seq.from_pretrained(
+            repo_id, export=True, local_files_only=True,
+            quantization_config=OVWeightQuantizationConfig(bits=8),
+        )
+        model.save_pretrained(ir_dir)
+        processor.save_pretrained(ir_dir)
+    return pipeline(
+        'automatic-speech-recognition',
+        model=model,
+        tokenizer=processor.tokenizer,
+        feature_extractor=processor.feature_extractor,
+        chunk_length_s=30,
+    )
+
+
+_BACKEND_LOADERS = {
+    'faster_whisper': _load_faster_whisper,
+    'whisperx': _load_whisperx,
+    'transformers_compiled': _load_transformers_compiled,
+    'openvino': _load_openvino,
+}
+
+
+def load_model_offline(model_name, backend='faster_whisper', device='cpu'):
+    """
+    Загружает модель Whisper выбранного бэкенда из локального кэша (офлайн-режим).
+    Выдает ошибку, если модель не найдена в кэше.
+    Уже загруженная в этом процессе модель возвращается из _MODEL_CACHE.
+    """
+    cache_key = (backend, model_name, device)
+    if cache_key in _MODEL_CACHE:
+        return _MODEL_CACHE[cache_key]
+
     try:
-        # Whisper автоматически использует кэш из ~/.cache/whisper/ или XDG_CACHE_HOME/whisper/
-        # Если модель есть в кэше, сетевых запросов не будет
-        model = whisper.load_model(model_name)
-        print(f"✓ Модель '{model_name}' загружена из локального кэша (офлайн-режим)")
-        return model
+        model = _BACKEND_LOADERS[backend](model_name, device)
+    except ImportError as e:
+        print(f"Ошибка: не установлены зависимости бэкенда '{backend}': {e}")
+        print(f"Установите их командой: pip install {BACKEND_PACKAGES[backend]}")
+        return None
     except Exception as e:
         error_msg = str(e).lower()
         # Проверяем, не связана ли ошибка с попыткой загрузки из сети
-        if any(keyword in error_msg for keyword in ['connection', 'network', 'download', 'url', 'http']):
-            print(f"Ошибка: попытка сетевого соединения при загрузке модели.")
-            print(f"Убедитесь, что модель '{model_name}' полностью загружена в кэш.")
-            print(f"Ожидаемый путь: {model_path}")
+        if any(keyword in error_msg for keyword in ['connection', 'network', 'download', 'url', 'http',
+                                                    'local_files_only', 'cache']):
+            print(f"Ошибка: модель '{model_name}' не найдена в локальном кэше ({backend}).")
+            print(f"Убедитесь, что модель '{model_name}' полностью загружена в кэш: {get_whisper_cache_dir()}")
         else:
             print(f"Ошибка при загрузке модели из кэша: {e}")
         return None
 
+    if model is None:
+        cache_dir = get_whisper_cache_dir()
+        print(f"Ошибка: модель '{model_name}' не найдена в локальном кэше.")
+        print(f"Ожидаемый путь: {cache_dir} (faster-whisper-{MODEL_IDS.get(model_name, model_name)})")
+        print("\nДля работы в офлайн-режиме необходимо предварительно загрузить модель.")
+        print("Запустите скрипт с интернет-соединением один раз, чтобы загрузить модель в кэш.")
+        print(f"Или загрузите модель вручную в директорию: {cache_dir}")
+        return None
+
+    _MODEL_CACHE[cache_key] = model
+    print(f"✓ Модель '{model_name}' ({backend}, {device}) загружена из локального кэша (офлайн-режим)")
+    return model
+
+
+# Шаблоны Markdown для сегментов транскрипции
+SEGMENT_TEMPLATE = "### [%s] Сегмент %d\n\n%s\n\n"
+SCREENSHOT_TEMPLATE = "![Скриншот %s](screenshots/%s)\n\n"
+SEPARATOR = "---\n\n"
+
+# Частота дискретизации, с которой работают все модели Whisper
+SAMPLE_RATE = 16000
+
+
+def _extract_audio(video_path):
+    """
+    Извлекает звуковую дорожку как 16 кГц моно float32 (формат входа Whisper).
+    Видеопоток не декодируется. Возвращает numpy-массив или None при ошибке.
+    """
+    import numpy as np
+
+    try:
+        result = subprocess.run(
+            ['ffmpeg', '-nostdin', '-i', str(video_path),
+             '-vn', '-f', 's16le', '-ac', '1', '-ar', str(SAMPLE_RATE), '-'],
+            capture_output=True,
+            check=True
+        )
+    except (subprocess.CalledProcessError, FileNotFoundError) as e:
+        print(f"Предупреждение: не удалось извлечь аудио, распознавание по видеофайлу: {e}")
+        return None
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
+
+
+def _audio_source(audio):
+    """Путь к файлу передаётся строкой; numpy-массив — как есть."""
+    return audio if hasattr(audio, 'dtype') else str(audio)
+
+
+def _speech_regions(audio):
+    """
+    Находит участки речи детектором Silero VAD, входящим в faster-whisper
+    (ONNX-модель в составе пакета, без сетевых запросов).
+    Возвращает список (начало, конец) в отсчётах или None, если VAD недоступен.
+    """
+    try:
+        from faster_whisper.vad import get_speech_timestamps
+    except ImportError:
+        print("Предупреждение: VAD недоступен без пакета faster-whisper, распознаётся вся запись.")
+        return None
+    return [(chunk['start'], chunk['end']) for chunk in get_speech_timestamps(audio)]
+
+
+def _vad_gate(audio):
+    """
+    Оставляет в записи только участки речи.
+    Возвращает (склеенный звук, таблица смещений) или (audio, None),
+    если VAD недоступен или речи не найдено.
+    """
+    import numpy as np
+
+    regions = _speech_regions(audio)
+    if not regions:
+        return audio, None
+    # Таблица смещений: (начало участка в склеенной записи, начало в исходной), в секундах
+    offsets = []
+    position = 0
+    for start, end in regions:
+        offsets.append((position / SAMPLE_RATE, start / SAMPLE_RATE))
+        position += end - start
+    speech = np.concatenate([audio[start:end] for start, end in regions])
+    return speech, offsets
+
+
+def _original_time(t, offsets):
+    """Переводит время в склеенной записи во время исходного видео."""
+    if t is None:
+        return None
+    index = max(bisect_right(offsets, (t, float('inf'))) - 1, 0)
+    gated_start, original_start = offsets[index]
+    return original_start + (t - gated_start)
+
+
+def _transcribe_faster_whisper(model, audio, language, vad=False):
+    # vad_filter: встроенный Silero VAD, время сегментов уже в шкале исходной записи
+    segments_iter, _info = model.transcribe(
+        _audio_source(audio), language=language, vad_filter=vad
+    )
+    # faster-whisper возвращает ленивый генератор: распознавание идёт при итерации
+    return [
+        {'start': seg.start, 'end': seg.end, 'text': seg.text}
+        for seg in segments_iter
+    ]
+
+
+def _transcribe_whisperx(model, audio, language, vad=False):
+    # whisperx всегда разбивает запись по участкам речи собственным VAD
+    import whisperx
+
+    if not hasattr(audio, 'dtype'):
+        audio = whisperx.load_audio(str(audio))
+    result = model.transcribe(audio, batch_size=16, language=language)
+    return [
+        {'start': seg.get('start'), 'end': seg.get('end'), 'text': seg.get('text')}
+        for seg in result.get('segments', [])
+    ]
+
+
+def _transcribe_transformers(model, audio, language, vad=False):
+    offsets = None
+    if hasattr(audio, 'dtype'):
+        if vad:
+            audio, offsets = _vad_gate(audio)
+        inputs = {'raw': audio, 'sampling_rate': SAMPLE_RATE}
+    else:
+        inputs = str(audio)
+    result = model(
+        inputs,
+        return_timestamps=True,
+        generate_kwargs={'language': language, 'task': 'transcribe'},
+    )
+    segments = []
+    for chunk in result.get('chunks', []):
+        start, end = chunk.get('timestamp') or (None, None)
+        if offsets:
+            start, end = _original_time(start, offsets), _original_time(end, offsets)
+        segments.append({'start': start, 'end': end, 'text': chunk.get('text')})
+    return segments
+
+
+_BACKEND_TRANSCRIBERS = {
+    'faster_whisper': _transcribe_faster_whisper,
+    'whisperx': _transcribe_whisperx,
+    'transformers_compiled': _transcribe_transformers,
+    # OpenVINO-модель обёрнута в тот же pipeline transformers
+    'openvino': _transcribe_transformers,
+}
 
+
+def transcribe(model, audio, language='ru', backend='faster_whisper', vad=True):
+    """
+    Распознаёт речь выбранным бэкендом и приводит результат к формату
+    {'text': ..., 'segments': [{'start', 'end', 'text'}, ...]}.
+    audio — путь к файлу или numpy-массив 16 кГц моно (см. _extract_audio).
+    vad — распознавать только участки речи (тишина пропускается).
+    """
+    segments = _BACKEND_TRANSCRIBERS[backend](model, audio, language, vad=vad)
+    return {
+        'text': ''.join(seg['text'] or '' for seg in segments),
+        'segments': segments,
+    }
+
+
+@lru_cache(maxsize=1)
 def check_ffmpeg():
-    """Проверяет наличие ffmpeg в системе."""
+    """Проверяет наличие ffmpeg в системе (один раз за запуск)."""
     try:
         subprocess.run(['ffmpeg', '-version'], 
                       capture_output=True, check=True)
@@ -102,56 +423,194 @@ def check_ffmpeg():
         return False
 
 
-def get_video_duration(video_path):
-    """Получает длительность видео в секундах."""
-    if video_path is None:
+# Результат ffprobe: длительность (с) и частота кадров видеопотока; поля могут быть None
+VideoInfo = namedtuple('VideoInfo', ['duration', 'fps'])
+
+
+def _parse_float(value):
+    """Преобразует значение ffprobe в float (включая дроби вида '30000/1001')."""
+    if value in (None, '', 'N/A'):
         return None
-    path = Path(video_path) if not isinstance(video_path, Path) else video_path
-    if not str(path).strip() or not path.is_file():
+    try:
+        if isinstance(value, str) and '/' in value:
+            num, den = value.split('/', 1)
+            den = float(den)
+            return float(num) / den if den else None
+        return float(value)
+    except (TypeError, ValueError):
         return None
+
+
+@lru_cache(maxsize=32)
+def _probe_video_cached(path_str, mtime_ns, size):
+    """
+    Один вызов ffprobe на файл. mtime_ns и size входят в ключ кэша,
+    чтобы изменённый файл был перечитан.
+    """
     try:
         result = subprocess.run(
-            ['ffprobe', '-v', 'error', '-show_entries',
-             'format=duration', '-of', 'default=noprint_wrappers=1:nokey=1',
-             str(path)],
+            ['ffprobe', '-v', 'error', '-select_streams', 'v:0',
+             '-show_entries', 'stream=r_frame_rate,duration:format=duration',
+             '-of', 'json', path_str],
             capture_output=True,
             text=True,
             check=True
         )
-        raw = (result.stdout or '').strip()
-        return float(raw) if raw else None
-    except (subprocess.CalledProcessError, ValueError, FileNotFoundError, TypeError):
+        data = json.loads(result.stdout or '{}')
+    except (subprocess.CalledProcessError, ValueError, FileNotFoundError):
+        return VideoInfo(None, None)
+
+    streams = data.get('streams') or [{}]
+    stream = streams[0]
+    duration = _parse_float((data.get('format') or {}).get('duration'))
+    if duration is None:
+        duration = _parse_float(stream.get('duration'))
+    fps = _parse_float(stream.get('r_frame_rate'))
+    return VideoInfo(duration, fps)
+
+
+def probe_video(video_path):
+    """
+    Получает длительность и частоту кадров видео одним вызовом ffprobe.
+    Повторные вызовы для того же (неизменённого) файла берутся из кэша.
+    """
+    if video_path is None:
+        return VideoInfo(None, None)
+    path = Path(video_path) if not isinstance(video_path, Path) else video_path
+    path_str = str(path)
+    if not path_str.strip():
+        return VideoInfo(None, None)
+    try:
+        st = path.stat()
+    except (OSError, ValueError):
+        return VideoInfo(None, None)
+    if not stat.S_ISREG(st.st_mode):
+        return VideoInfo(None, None)
+    return _probe_video_cached(path_str, st.st_mtime_ns, st.st_size)
+
+
+def _screenshot_name(base_name, index):
+    """Имя файла скриншота с порядковым номером index (с 1)."""
+    return f"{base_name}_screenshot_{index:02d}.png"
+
+
+def _extract_screenshots_batch(video_path, screenshots_dir, timestamps, base_name, fps=None):
+    """
+    Извлекает все скриншоты одним вызовом ffmpeg через фильтр select.
+    Для каждой метки выбирается первый кадр с t >= метки, поэтому файл проходится
+    один раз вместо отдельного декодирования для каждого скриншота.
+    Возвращает список (timestamp, имя_файла) или None, если пакетный режим
+    неприменим или дал не то число кадров (тогда нужен поштучный режим).
+    fps (если известна) позволяет заранее отказаться от пакетного режима,
+    когда две метки попадают на один кадр.
+    """
+    # Нумерация выходных файлов ffmpeg совпадает с порядком меток только
+    # для строго возрастающих меток
+    min_gap = 1.0 / fps if fps else 0
+    if any(b - a <= min_gap for a, b in zip(timestamps, timestamps[1:])):
+        return None
+
+    names = [_screenshot_name(base_name, i) for i in range(1, len(timestamps) + 1)]
+    # Удаляем старые файлы, чтобы по наличию файлов проверить результат этого запуска
+    for name in names:
+        try:
+            (screenshots_dir / name).unlink()
+        except FileNotFoundError:
+            pass
+
+    # Кадр выбран для метки ts, если он первый с t >= ts (у предыдущего кадра t < ts)
+    select_expr = '+'.join(
+        f"gte(t,{ts})*(isnan(prev_pts)+lt(prev_pts*TB,{ts}))" for ts in timestamps
+    )
+    # '%' в имени видео экранируется для шаблона image2
+    output_pattern = screenshots_dir / f"{base_name.replace('%', '%%')}_screenshot_%02d.png"
+    try:
+        subprocess.run(
+            ['ffmpeg', '-y', '-i', str(video_path),
+             '-vf', f"select='{select_expr}'", '-vsync', '0',
+             '-q:v', '2', str(output_pattern)],
+            capture_output=True,
+            check=True
+        )
+    except subprocess.CalledProcessError as e:
+        print(f"Предупреждение: пакетное извлечение скриншотов не удалось: {e}")
+        return None
+
+    if not all((screenshots_dir / name).is_file() for name in names):
         return None
+    return list(zip(timestamps, names))
 
 
-def extract_screenshots(video_path, screenshots_dir, timestamps, base_name):
-    """Извлекает скриншоты из видео в указанные моменты времени."""
+def _extract_one(video_path, timestamp, screenshot_path):
+    """
+    Извлекает один кадр на указанной секунде. Возвращает True при успехе.
+    video_path — уже преобразованный в строку путь.
+    """
+    try:
+        # -ss перед -i: переход к ближайшему ключевому кадру по индексу контейнера
+        # вместо декодирования с начала файла; точность до кадра сохраняется
+        # (accurate_seek включён по умолчанию)
+        subprocess.run(
+            ['ffmpeg', '-y', '-ss', str(timestamp), '-i', video_path,
+             '-frames:v', '1', '-q:v', '2', str(screenshot_path)],
+            capture_output=True,
+            check=True
+        )
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"Предупреждение: не удалось извлечь скриншот на {timestamp}с: {e}")
+        return False
+
+
+def _extract_screenshots_each(video_path, screenshots_dir, timestamps, base_name):
+    """
+    Извлекает скриншоты по одному вызову ffmpeg на каждую метку времени.
+    Вызовы выполняются параллельно в пуле потоков: потоки ждут дочерние
+    процессы ffmpeg, поэтому GIL не ограничивает параллелизм.
+    """
     screenshots = []
+    max_workers = min(len(timestamps), os.cpu_count() or 1)
+    video_path_str = str(video_path)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for i, timestamp in enumerate(timestamps, 1):
+            screenshot_name = _screenshot_name(base_name, i)
+            future = executor.submit(
+                _extract_one, video_path_str, timestamp, screenshots_dir / screenshot_name
+            )
+            futures[future] = (timestamp, screenshot_name)
+
+        for future in as_completed(futures):
+            if future.result():
+                screenshots.append(futures[future])
+
+    # Порядок завершения произвольный — восстанавливаем порядок по времени
+    screenshots.sort(key=lambda item: item[0])
+    return screenshots
+
+
+def extract_screenshots(video_path, screenshots_dir, timestamps, base_name, fps=None):
+    """Извлекает скриншоты из видео в указанные моменты времени."""
     base_name = (base_name or "video").replace(' ', '_').replace('/', '_')
+    timestamps = [ts for ts in timestamps if ts is not None]
+    if not timestamps:
+        return []
 
-    for i, timestamp in enumerate(timestamps, 1):
-        if timestamp is None:
-            continue
-        screenshot_name = f"{base_name}_screenshot_{i:02d}.png"
-        screenshot_path = screenshots_dir / screenshot_name
-        
-        try:
-            # Извлекаем кадр на указанной секунде
-            subprocess.run(
-                ['ffmpeg', '-y', '-i', str(video_path),
-                 '-ss', str(timestamp), '-vframes', '1',
-                 '-q:v', '2', str(screenshot_path)],
-                capture_output=True,
-                check=True
-            )
-            screenshots.append((timestamp, screenshot_name))
-        except subprocess.CalledProcessError as e:
-            print(f"Предупреждение: не удалось извлечь скриншот на {timestamp}с: {e}")
-            continue
-    
+    # Основной путь — один проход ffmpeg; поштучный режим — запасной
+    screenshots = _extract_screenshots_batch(
+        video_path, screenshots_dir, timestamps, base_name, fps=fps
+    )
+    if screenshots is None:
+        screenshots = _extract_screenshots_each(video_path, screenshots_dir, timestamps, base_name)
     return screenshots
 
 
+def _timestamp_key(seconds):
+    """Ключ метки времени для поиска скриншота: целые сотые доли секунды."""
+    return int(round(float(seconds) * 100))
+
+
 def format_timestamp(seconds):
     """Форматирует секунды в формат MM:SS или HH:MM:SS."""
     if seconds is None:
@@ -160,18 +619,24 @@ def format_timestamp(seconds):
         seconds = float(seconds)
     except (TypeError, ValueError):
         seconds = 0
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = int(seconds % 60)
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
     
     if hours > 0:
-        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+        return "%02d:%02d:%02d" % (hours, minutes, secs)
     else:
-        return f"{minutes:02d}:{secs:02d}"
+        return "%02d:%02d" % (minutes, secs)
 
 
-def convert_video_to_md(video_path, model_name='base'):
-    """Конвертирует видео файл в Markdown документ."""
+def convert_video_to_md(video_path, model_name='base', model=None, backend='faster_whisper',
+                        device='auto', force=False, vad=True, now_str=None):
+    """
+    Конвертирует видео файл в Markdown документ.
+    model — уже загруженная модель Whisper; если не передана, загружается по model_name.
+    force — конвертировать заново, даже если MD файл новее видео.
+    vad — пропускать тишину при распознавании (Silero VAD).
+    now_str — дата создания для документа; по умолчанию текущее время.
+    """
     # Защита от пустого или невалидного пути
     if video_path is None:
         print("Ошибка: путь к видео не указан (None).")
@@ -184,10 +649,13 @@ def convert_video_to_md(video_path, model_name='base'):
     video_path = Path(video_path)
     model_name = (model_name or '').strip() or 'base'
 
-    if not video_path.exists():
+    # Один stat() вместо exists() + is_file()
+    try:
+        video_stat = video_path.stat()
+    except FileNotFoundError:
         print(f"Ошибка: файл {video_path} не найден.")
         return False
-    if not video_path.is_file():
+    if not stat.S_ISREG(video_stat.st_mode):
         print(f"Ошибка: {video_path} не является файлом (возможно, это каталог).")
         return False
     
@@ -204,10 +672,19 @@ def convert_video_to_md(video_path, model_name='base'):
     
     # MD файл — в той же папке, где видео
     md_file = video_dir / f"{video_name}.md"
+
+    # MD файл новее видео — конвертация уже выполнена, распознавание не повторяем
+    if not force:
+        try:
+            if md_file.stat().st_mtime >= video_stat.st_mtime:
+                print(f"✓ {md_file.name} уже конвертировано, пропуск (--force для повторной конвертации)")
+                return True
+        except FileNotFoundError:
+            pass
     
-    # Папка screenshots — вложенная в папку с видео (рабочую директорию)
+    # Папка screenshots — вложенная в папку с видео (рабочую директорию);
+    # создаётся только перед извлечением скриншотов
     screenshots_dir = video_dir / "screenshots"
-    screenshots_dir.mkdir(exist_ok=True)
     
     # Базовое имя для скриншотов (без расширения, с заменой пробелов)
     base_name = (video_name or "video").replace(' ', '_').replace('/', '_')
@@ -217,16 +694,25 @@ def convert_video_to_md(video_path, model_name='base'):
     if not has_ffmpeg:
         print("Предупреждение: ffmpeg не найден. Скриншоты не будут извлечены.")
 
-    # Загружаем модель Whisper из локального кэша (офлайн-режим)
-    print(f"Загрузка модели Whisper '{model_name}' из локального кэша...")
-    model = load_model_offline(model_name)
+    # Загружаем модель Whisper из локального кэша (офлайн-режим), если её не передали
     if model is None:
-        return False
+        print(f"Загрузка модели Whisper '{model_name}' из локального кэша...")
+        model = load_model_offline(model_name, backend, resolve_device(device))
+        if model is None:
+            return False
+
+    # Whisper получает только звук: без ffmpeg бэкенд декодирует файл сам
+    audio = _extract_audio(video_path) if has_ffmpeg else None
+    if audio is None:
+        audio = video_path
 
     # Распознаём речь (офлайн-режим, без сетевых запросов)
     print("Распознавание речи...")
     try:
-        result = model.transcribe(str(video_path), language='ru')
+        # Модель общая для потоков: распознавание выполняется по одному файлу за раз,
+        # остальные потоки в это время извлекают скриншоты и пишут Markdown
+        with _TRANSCRIBE_LOCK:
+            result = transcribe(model, audio, language='ru', backend=backend, vad=vad)
     except Exception as e:
         print(f"Ошибка при распознавании речи: {e}")
         return False
@@ -251,8 +737,8 @@ def convert_video_to_md(video_path, model_name='base'):
         max_screenshots = min(15, len(segments))
         
         # Получаем длительность видео для равномерного распределения
-        duration = get_video_duration(video_path)
-        if duration:
+        video_info = probe_video(video_path)
+        if video_info.duration:
             # Выбираем моменты из начала каждого сегмента
             selected_indices = []
             if max_screenshots == 1:
@@ -269,63 +755,75 @@ def convert_video_to_md(video_path, model_name='base'):
             timestamps = timestamps[:max_screenshots]
         
         # Извлекаем скриншоты
+        screenshots_dir.mkdir(exist_ok=True)
         print(f"Извлечение {len(timestamps)} скриншотов...")
-        screenshots = extract_screenshots(video_path, screenshots_dir, timestamps, base_name)
+        screenshots = extract_screenshots(
+            video_path, screenshots_dir, timestamps, base_name, fps=video_info.fps
+        )
         print(f"Извлечено {len(screenshots)} скриншотов.")
     
-    # Создаем словарь скриншотов по времени для быстрого поиска
-    screenshot_map = {ts: name for ts, name in screenshots}
+    # Создаем словарь скриншотов по времени для быстрого поиска.
+    # Ключ — время в сотых долях секунды: целое число не зависит от погрешности float
+    screenshot_map = {_timestamp_key(ts): name for ts, name in screenshots}
     
     # Формируем Markdown документ
     print("Создание Markdown документа...")
     
-    md_content = f"# {video_name}\n\n"
-    md_content += f"*Автоматически создано из видео: {video_path.name}*\n\n"
-    md_content += f"*Дата создания: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}*\n\n"
-    md_content += "---\n\n"
+    # Части документа собираются в список и склеиваются один раз (без квадратичного +=)
+    parts = [f"# {video_name}\n\n"]
+    parts.append(f"*Автоматически создано из видео: {video_path.name}*\n\n")
+    if now_str is None:
+        now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    parts.append(f"*Дата создания: {now_str}*\n\n")
+    parts.append("---\n\n")
     
     # Полный текст транскрипции
     full_text = (result or {}).get('text', '') or ''
     full_text = full_text.strip() if isinstance(full_text, str) else ''
     if full_text:
-        md_content += "## Полный текст транскрипции\n\n"
-        md_content += f"{full_text}\n\n"
-        md_content += "---\n\n"
+        parts.append("## Полный текст транскрипции\n\n")
+        parts.append(f"{full_text}\n\n")
+        parts.append("---\n\n")
     
     # Сегменты с временными метками
-    md_content += "## Сегменты с временными метками\n\n"
+    parts.append("## Сегменты с временными метками\n\n")
     
     for i, segment in enumerate(segments, 1):
         start = segment.get('start')
         start = 0 if start is None else start
-        end = segment.get('end', 0)
-        text = (segment.get('text') or '').strip() if isinstance(segment.get('text'), str) else ''
+        text = segment.get('text') or ''
+        text = text.strip() if isinstance(text, str) else ''
         
         timestamp_str = format_timestamp(start)
-        md_content += f"### [{timestamp_str}] Сегмент {i}\n\n"
-        md_content += f"{text}\n\n"
+        parts.append(SEGMENT_TEMPLATE % (timestamp_str, i, text))
         
         # Добавляем скриншот, если есть для этого момента
-        if start in screenshot_map:
-            screenshot_name = screenshot_map[start]
-            # Относительный путь от MD файла к папке screenshots (вложена в ту же директорию)
-            relative_path = f"screenshots/{screenshot_name}"
-            md_content += f"![Скриншот {timestamp_str}]({relative_path})\n\n"
+        # (относительный путь от MD файла к папке screenshots в той же директории)
+        screenshot_name = screenshot_map.get(_timestamp_key(start))
+        if screenshot_name is not None:
+            parts.append(SCREENSHOT_TEMPLATE % (timestamp_str, screenshot_name))
         
-        md_content += "---\n\n"
+        parts.append(SEPARATOR)
     
-    # Сохраняем MD файл
+    # Сохраняем MD файл: запись во временный файл и атомарная замена,
+    # чтобы при сбое не остался наполовину записанный документ
+    md_tmp = md_file.with_suffix('.md.tmp')
     try:
-        md_file.write_text(md_content, encoding='utf-8')
+        md_tmp.write_text(''.join(parts), encoding='utf-8')
+        os.replace(md_tmp, md_file)
         print(f"✓ Markdown файл создан: {md_file}")
     except Exception as e:
         print(f"Ошибка при сохранении MD файла: {e}")
+        try:
+            md_tmp.unlink()
+        except OSError:
+            pass
         return False
     
-    # Переименовываем исходное видео
+    # Переименовываем исходное видео (os.replace перезаписывает цель и на Windows)
     converted_video = video_dir / f"{video_name}-converted{video_ext}"
     try:
-        video_path.rename(converted_video)
+        os.replace(video_path, converted_video)
         print(f"✓ Видео переименовано: {converted_video.name}")
     except Exception as e:
         print(f"Предупреждение: не удалось переименовать видео: {e}")
@@ -338,6 +836,15 @@ def convert_video_to_md(video_path, model_name='base'):
     return True
 
 
+def _init_worker(model_name, backend, device, cpu_threads):
+    """
+    Инициализация процесса-обработчика: ограничивает число потоков вычислений,
+    чтобы процессы не конкурировали за ядра, и загружает модель в _MODEL_CACHE.
+    """
+    os.environ['OMP_NUM_THREADS'] = str(cpu_threads)
+    load_model_offline(model_name, backend, device)
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Конвертирует видео файлы в Markdown документы с распознаванием речи и извлечением скриншотов. '
@@ -354,6 +861,40 @@ def main():
         choices=['tiny', 'base', 'small', 'medium', 'large'],
         help='Модель Whisper для распознавания (по умолчанию: base)'
     )
+    parser.add_argument(
+        '--device',
+        default='auto',
+        choices=['auto', 'cpu', 'cuda', 'mps'],
+        help='Устройство для распознавания: auto выбирает GPU (cuda/mps) при наличии, '
+             'иначе CPU (по умолчанию: auto)'
+    )
+    parser.add_argument(
+        '--backend',
+        default='faster_whisper',
+        choices=list(_BACKEND_LOADERS),
+        help='Бэкенд распознавания: faster_whisper (CTranslate2 int8), whisperx, '
+             'transformers_compiled (статический KV-кэш + torch.compile), '
+             'openvino (int8 для x86 CPU) (по умолчанию: faster_whisper)'
+    )
+    parser.add_argument(
+        '--vad',
+        action=argparse.BooleanOptionalAction,
+        default=True,
+        help='Распознавать только участки речи, пропуская тишину (Silero VAD); '
+             '--no-vad — распознавать запись целиком (по умолчанию: включено)'
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Конвертировать заново, даже если MD файл уже существует и новее видео'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=0,
+        help='Число файлов, обрабатываемых параллельно (по умолчанию: 0 — автоматически; '
+             '1 — последовательно)'
+    )
     
     args = parser.parse_args()
 
@@ -372,16 +913,53 @@ def main():
         print("\nПример:")
         print('  python3 scripts/convert_video_to_md.py "путь/к/видео.mp4"')
         sys.exit(1)
-    model = (args.model or '').strip() or 'base'
-
-    success_count = 0
-    fail_count = 0
-
-    for video_file in video_files:
-        if convert_video_to_md(video_file, model):
-            success_count += 1
+    model_name = (args.model or '').strip() or 'base'
+    device = resolve_device(args.device)
+    # Дата создания одна на весь запуск
+    now_str = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+    cpu_count = os.cpu_count() or 1
+    if args.jobs and args.jobs > 0:
+        jobs = args.jobs
+    elif device == 'cpu':
+        # Распознавание на CPU само многопоточное — по процессу на два ядра
+        jobs = max(1, cpu_count // 2)
+    else:
+        # Один GPU: второй поток извлекает скриншоты, пока первый распознаёт речь
+        jobs = 2
+    jobs = min(jobs, len(video_files))
+
+    if jobs > 1 and device == 'cpu':
+        # Несколько файлов на CPU: отдельные процессы, в каждом своя модель
+        print(f"Параллельная обработка: {jobs} процесса(ов)")
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_worker,
+            initargs=(model_name, args.backend, device, max(1, cpu_count // jobs)),
+        ) as executor:
+            results = list(executor.map(
+                partial(convert_video_to_md, model_name=model_name,
+                        backend=args.backend, device=device, force=args.force,
+                        vad=args.vad, now_str=now_str),
+                video_files,
+            ))
+    else:
+        # Модель загружается один раз на весь запуск и переиспользуется для всех файлов
+        print(f"Загрузка модели Whisper '{model_name}' из локального кэша...")
+        model = load_model_offline(model_name, args.backend, device)
+        if model is None:
+            sys.exit(1)
+        convert = partial(convert_video_to_md, model_name=model_name, model=model,
+                          backend=args.backend, device=device, force=args.force,
+                          vad=args.vad, now_str=now_str)
+        if jobs > 1:
+            with ThreadPoolExecutor(max_workers=jobs) as executor:
+                results = list(executor.map(convert, video_files))
         else:
-            fail_count += 1
+            results = [convert(video_file) for video_file in video_files]
+
+    success_count = sum(1 for ok in results if ok)
+    fail_count = len(results) - success_count
     
     print("\n" + "=" * 60)
     print(f"Итого: успешно {success_count}, ошибок {fail_count}")
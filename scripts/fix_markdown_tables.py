@@ -17,10 +17,51 @@
     python3 scripts/fix_markdown_tables.py
 """
 
-import re
+import json
+import mmap
+import os
+import shutil
+import stat
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import List, Tuple
+from typing import Dict, List, Tuple
+
+
+# Пробельные символы (как \s в re) вместе с '-' и '|' — допустимые символы разделителя
+_WHITESPACE = ('\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680\u2000\u2001\u2002\u2003'
+               '\u2004\u2005\u2006\u2007\u2008\u2009\u200a\u2028\u2029\u202f\u205f\u3000')
+_SEP_CHARS = _WHITESPACE + '-|'
+# Служебные директории, в которых Markdown файлы не обрабатываются
+_SKIP_DIRS = {'.git', '.cursor', 'node_modules', '.venv'}
+
+# Допустимые символы первой ячейки длинного разделителя
+_LONG_CELL_CHARS = _WHITESPACE + '-'
+# Серия дефисов, без которой разделитель не считается длинным
+_LONG_DASH = '-' * 20
+_LONG_DASH_BYTES = _LONG_DASH.encode('ascii')
+
+# Кэш между запусками: путь -> [mtime_ns, размер] файлов, в которых нечего исправлять
+_CACHE_FILE = Path('.fix_markdown_tables_cache.json')
+
+
+def _is_long_separator(line: str) -> bool:
+    """
+    Длинный разделитель: первая ячейка из 20+ дефисов/пробелов, среди них
+    серия из 20 дефисов (то же, что r'^\|[\s\-]{20,}\|', но строковыми методами).
+    """
+    if not line.startswith('|') or _LONG_DASH not in line:
+        return False
+    tail = line[1:]
+    cell = len(tail) - len(tail.lstrip(_LONG_CELL_CHARS))
+    return cell >= 20 and tail[cell:cell + 1] == '|'
+
+
+@lru_cache(maxsize=32)
+def _separator_for(columns: int) -> str:
+    """Стандартный разделитель | --- | --- | ... | для заданного числа колонок (кэшируется)."""
+    return '| ' + ' | '.join(['---'] * columns) + ' |'
 
 
 def fix_table_separator(line: str) -> str:
@@ -33,8 +74,17 @@ def fix_table_separator(line: str) -> str:
     Returns:
         Исправленная строка
     """
-    # Проверяем, является ли строка разделителем таблицы
-    if not re.match(r'^\|[\s\-|]+\|', line):
+    # Проверяем, является ли строка разделителем таблицы: после первого |
+    # идут только пробелы, - и |, среди которых (не первым) есть ещё один |
+    # (то же, что r'^\|[\s\-|]+\|', но строковыми методами)
+    if not line.startswith('|'):
+        return line
+    # Уже стандартный разделитель (повторный запуск) возвращается как есть
+    if line.startswith('| --- |') and line == _separator_for(line.count('|') - 1):
+        return line
+    tail = line[1:]
+    sep_run = tail[:len(tail) - len(tail.lstrip(_SEP_CHARS))]
+    if '|' not in sep_run[1:]:
         return line
     
     # Подсчитываем количество колонок (количество |)
@@ -43,10 +93,7 @@ def fix_table_separator(line: str) -> str:
     if columns <= 0:
         return line
     
-    # Создаем стандартный разделитель: | --- | --- | ... |
-    separator = '| ' + ' | '.join(['---'] * columns) + ' |'
-    
-    return separator
+    return _separator_for(columns)
 
 
 def fix_tables_in_content(content: str) -> Tuple[str, int]:
@@ -59,45 +106,70 @@ def fix_tables_in_content(content: str) -> Tuple[str, int]:
     Returns:
         Кортеж (исправленное содержимое, количество исправленных таблиц)
     """
-    lines = content.split('\n')
-    fixed_lines = []
-    fixed_count = 0
-    i = 0
+    # Нет ни одного | — нет и таблиц: содержимое возвращается без разбиения на строки
+    if '|' not in content:
+        return content, 0
     
-    while i < len(lines):
-        line = lines[i]
+    # Вместо разбиения на строки идём по содержимому поиском '\n|' (str.find
+    # работает в C через memchr) и смотрим только строки, начинающиеся с |.
+    # Исправления копятся как (начало, конец, новый разделитель) и
+    # подставляются одной склейкой срезов
+    edits = []
+    length = len(content)
+    if content.startswith('|'):
+        pos = 0
+    else:
+        pos = content.find('\n|') + 1
+        if pos == 0:
+            return content, 0
+    
+    while True:
+        end = content.find('\n', pos)
+        if end == -1:
+            # Последняя строка: следующей строки-разделителя у неё нет
+            break
         
-        # Проверяем, является ли строка началом таблицы (содержит |)
-        if '|' in line and re.match(r'^\|.*\|.*\|', line):
-            # Это может быть заголовок таблицы
-            fixed_lines.append(line)
-            i += 1
+        # Проверяем, является ли строка началом таблицы (не менее трёх |)
+        if content.count('|', pos, end) >= 3:
+            # Это может быть заголовок таблицы, следующая строка - разделитель
+            start = end + 1
+            end = content.find('\n', start)
+            if end == -1:
+                end = length
+            next_line = content[start:end]
+            crlf = next_line.endswith('\r')
             
-            # Проверяем следующую строку - это должен быть разделитель
-            if i < len(lines):
-                next_line = lines[i]
-                
-                # Если это разделитель с длинными дефисами
-                if re.match(r'^\|[\s\-]{20,}\|', next_line):
-                    original = next_line
-                    fixed = fix_table_separator(next_line)
-                    
-                    if original != fixed:
-                        fixed_count += 1
-                        fixed_lines.append(fixed)
-                    else:
-                        fixed_lines.append(next_line)
-                    
-                    i += 1
-                else:
-                    # Не разделитель, просто добавляем
-                    fixed_lines.append(next_line)
-                    i += 1
-        else:
-            fixed_lines.append(line)
-            i += 1
+            # Стандартный разделитель для этого числа колонок (из кэша): уже
+            # исправленная строка отсекается одним сравнением строк.
+            # Если это разделитель с длинными дефисами — заменяем на стандартный
+            # (длинный разделитель всегда проходит проверку fix_table_separator,
+            # повторно её не выполняем)
+            fixed = _separator_for(next_line.count('|') - 1)
+            if ((next_line[:-1] if crlf else next_line) != fixed
+                    and _is_long_separator(next_line)):
+                # Окончание строки \r\n (CRLF) сохраняется
+                edits.append((start, end, fixed + '\r' if crlf else fixed))
+            
+            if end == length:
+                break
+        
+        # Следующая строка, начинающаяся с |
+        pos = content.find('\n|', end) + 1
+        if pos == 0:
+            break
     
-    return '\n'.join(fixed_lines), fixed_count
+    # Ничего не исправлено — возвращаем исходную строку без повторной склейки
+    if not edits:
+        return content, 0
+    # Число частей известно заранее: срез до каждой правки, сама правка и хвост
+    parts = [''] * (2 * len(edits) + 1)
+    last = 0
+    for j, (start, end, fixed) in enumerate(edits):
+        parts[2 * j] = content[last:start]
+        parts[2 * j + 1] = fixed
+        last = end
+    parts[-1] = content[last:]
+    return ''.join(parts), len(edits)
 
 
 def process_file(file_path: Path, dry_run: bool = False) -> Tuple[bool, int]:
@@ -112,18 +184,38 @@ def process_file(file_path: Path, dry_run: bool = False) -> Tuple[bool, int]:
         Кортеж (успешно ли обработан, количество исправленных таблиц)
     """
     try:
-        # Читаем файл
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        # Быстрая проверка без чтения и декодирования всего файла: без серии
+        # из 20 дефисов в файле нет длинных разделителей
+        with open(file_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return True, 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if mm.find(_LONG_DASH_BYTES) < 0:
+                    return True, 0
+            
+            # Читаем файл в двоичном режиме и декодируем один раз:
+            # без перевода строк текстового режима, окончания строк сохраняются
+            content = f.read().decode('utf-8')
         
         # Исправляем таблицы
         fixed_content, fixed_count = fix_tables_in_content(content)
         
         if fixed_count > 0:
             if not dry_run:
-                # Сохраняем исправленный файл
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(fixed_content)
+                # Сохраняем исправленный файл: запись во временный файл и атомарная
+                # замена, чтобы прерванная запись не оставила обрезанный файл
+                tmp_path = file_path.with_suffix(file_path.suffix + '.tmp')
+                try:
+                    with open(tmp_path, 'wb') as f:
+                        f.write(fixed_content.encode('utf-8'))
+                    shutil.copymode(file_path, tmp_path)
+                    os.replace(tmp_path, file_path)
+                except BaseException:
+                    try:
+                        tmp_path.unlink()
+                    except OSError:
+                        pass
+                    raise
                 print(f"✅ Исправлено {fixed_count} таблиц в: {file_path}")
             else:
                 print(f"🔍 Найдено {fixed_count} таблиц для исправления в: {file_path}")
@@ -148,15 +240,48 @@ def find_markdown_files(directory: Path) -> List[Path]:
         Список путей к Markdown файлам
     """
     markdown_files = []
+    stack = [str(directory)]
     
-    for file_path in directory.rglob('*.md'):
-        # Пропускаем файлы в .git и других служебных директориях
-        if '.git' not in file_path.parts and '.cursor' not in file_path.parts:
-            markdown_files.append(file_path)
+    # Обход через os.scandir: тип записи берётся из каталога без отдельного stat,
+    # служебные директории пропускаются целиком, без спуска в них.
+    # os.fwalk здесь не используется: он делает лишний stat на каждый каталог,
+    # а дескрипторы каталогов нельзя передать в процессы-обработчики
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in _SKIP_DIRS:
+                            stack.append(entry.path)
+                    elif entry.name.endswith('.md'):
+                        markdown_files.append(Path(entry.path))
+        except PermissionError:
+            continue
     
     return sorted(markdown_files)
 
 
+def load_cache() -> Dict[str, List[int]]:
+    """Загружает кэш проверенных файлов (пустой, если кэша нет или он повреждён)."""
+    try:
+        with open(_CACHE_FILE, encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def save_cache(cache: Dict[str, List[int]]) -> None:
+    """Сохраняет кэш проверенных файлов (ошибка записи не прерывает работу)."""
+    tmp_path = _CACHE_FILE.with_suffix(_CACHE_FILE.suffix + '.tmp')
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, ensure_ascii=False)
+        os.replace(tmp_path, _CACHE_FILE)
+    except OSError as e:
+        print(f"⚠️  Не удалось сохранить кэш {_CACHE_FILE}: {e}", file=sys.stderr)
+
+
 def main():
     """Главная функция."""
     import argparse
@@ -175,6 +300,11 @@ def main():
         action='store_true',
         help='Показать что будет исправлено, не сохранять изменения'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help=f'Проверить все файлы, не используя кэш {_CACHE_FILE}'
+    )
     parser.add_argument(
         '--verbose',
         action='store_true',
@@ -186,12 +316,15 @@ def main():
     # Определяем путь
     base_path = Path(args.path)
     
-    if not base_path.exists():
+    # Один stat вместо отдельных exists() и is_file()
+    try:
+        base_mode = base_path.stat().st_mode
+    except OSError:
         print(f"❌ Путь не найден: {base_path}", file=sys.stderr)
         sys.exit(1)
     
     # Определяем файлы для обработки
-    if base_path.is_file():
+    if not stat.S_ISDIR(base_mode):
         files = [base_path]
     else:
         files = find_markdown_files(base_path)
@@ -210,15 +343,50 @@ def main():
     processed = 0
     errors = 0
     
+    # Файлы, не изменившиеся с прошлого запуска (те же mtime и размер), в которых
+    # тогда нечего было исправлять, пропускаются без чтения
+    cache = {} if args.no_cache else load_cache()
+    file_stats = {}
+    pending = []
     for file_path in files:
-        success, fixed_count = process_file(file_path, dry_run=args.dry_run)
-        
+        try:
+            st = file_path.stat()
+        except OSError:
+            pending.append(file_path)
+            continue
+        file_stats[file_path] = [st.st_mtime_ns, st.st_size]
+        if cache.get(str(file_path)) == file_stats[file_path]:
+            processed += 1
+        else:
+            pending.append(file_path)
+    if args.verbose and processed:
+        print(f"⏭️  Пропущено без изменений (кэш): {processed}")
+    files = pending
+    
+    # Файлы независимы — обрабатываем их параллельно. В режиме dry-run работа
+    # сводится к чтению файлов, и потоки перекрывают ожидание диска без
+    # запуска процессов; при исправлении — несколько процессов
+    process = partial(process_file, dry_run=args.dry_run)
+    if len(files) > 1 and args.dry_run:
+        with ThreadPoolExecutor(max_workers=min(32, len(files))) as executor:
+            results = list(executor.map(process, files))
+    elif len(files) > 1:
+        with ProcessPoolExecutor() as executor:
+            results = list(executor.map(process, files, chunksize=16))
+    else:
+        results = [process(file_path) for file_path in files]
+    
+    for file_path, (success, fixed_count) in zip(files, results):
         if success:
             processed += 1
             total_fixed += fixed_count
+            if fixed_count == 0 and file_path in file_stats:
+                cache[str(file_path)] = file_stats[file_path]
         else:
             errors += 1
     
+    save_cache(cache)
+    
     # Итоговая статистика
     print()
     print("=" * 60)
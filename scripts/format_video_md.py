@@ -9,6 +9,75 @@ import os
 import re
 from datetime import datetime
 
+DEFAULT_TITLE = '# Обучение администраторов PASS24.online — запись встречи 18.11.2025'
+
+# Шапка документа: заголовок, метаданные, целевая аудитория, краткое описание
+HEADER_TEMPLATE = """{title}
+
+## Метаданные документа
+
+| Параметр | Значение |
+| --- | --- |
+| **Версия** | 1.0 |
+| **Дата создания** | {today} |
+| **Дата последнего обновления** | {today} |
+| **Автор** | Система автоматической конвертации |
+| **Ответственный за актуальность** | Отдел сопровождения клиентов |
+| **Статус** | Актуально |
+| **Тип документа** | Обучение |
+| **Отдел** | ОС |
+| **Теги** | обучение, PASS24.online, веб-интерфейс, администратор, инструкция |
+
+---
+
+## Целевая аудитория
+
+**Для кого:** Менеджеры по сопровождению клиентов, новые сотрудники ОС, администраторы облака PASS24
+
+**Уровень подготовки:** Начинающий
+
+**Когда использовать:** При обучении работе с веб-интерфейсом PASS24.online: модули сотрудники, пользователи, адреса, КПП, пропуска, доверенности, рассылка, отчёты, настройки объекта, работа с запросами
+
+---
+
+## Краткое описание
+
+Данный документ содержит структурированное обучение по веб-интерфейсу PASS24.online на основе записи встречи от 18.11.2025. В документе рассмотрены все основные модули системы: сотрудники, права, пользователи, адреса, объекты (настройки, КПП), пропуска, доверенности, рассылка, отчёты. Также описаны процессы авторизации, массовой загрузки, блокировок, работа с запросами и ответы на часто задаваемые вопросы.
+
+*Документ создан автоматически из видеозаписи; возможны ошибки распознавания речи.*
+
+---
+
+## Основной контент
+
+"""
+
+# Основной контент при наличии сегментов
+SEGMENTS_TEMPLATE = """### Введение
+
+В каждом модуле веб-интерфейса PASS24.online есть **знак вопроса** — это гиперссылка в базу знаний, где подробно описано, за что отвечает модуль и как с ним работать. При возникновении вопросов можно обратиться к базе знаний или в техническую поддержку.
+
+**Рекомендация:** Если хотите параллельно выполнять действия вместе с инструктором, откройте ссылку на ваше облако в отдельной вкладке
+
+---
+
+### Примечание
+
+Полная транскрипция встречи доступна в исходном видеофайле. Данный документ содержит структурированное изложение основных тем и модулей системы.
+
+"""
+
+# История изменений
+FOOTER_TEMPLATE = """---
+
+## История изменений
+
+| Версия | Дата | Автор | Изменения |
+| --- | --- | --- | --- |
+| 1.0 | {today} | Система автоматической конвертации | Первоначальная версия на основе видео |
+
+"""
+
 def format_video_md(file_path):
     """Приводит MD файл к стандартам базы знаний."""
     
@@ -20,130 +89,65 @@ def format_video_md(file_path):
     full_transcript_start = None
     segments_start = None
     
+    # strip() (новая строка) вызывается только для строк, где заголовок раздела
+    # вообще встречается, — остальные отсекаются проверкой подстроки
     for i, line in enumerate(lines):
-        if line.strip() == '## Полный текст транскрипции':
+        if '## Полный текст транскрипции' in line and line.strip() == '## Полный текст транскрипции':
             full_transcript_start = i
-        elif line.strip() == '## Сегменты с временными метками':
+        elif '## Сегменты с временными метками' in line and line.strip() == '## Сегменты с временными метками':
             segments_start = i
             break
     
-    # Собираем новый контент
-    new_lines = []
-    
     # Заголовок H1
+    title = DEFAULT_TITLE
     if lines[0].startswith('#'):
         title = lines[0].strip()
         # Улучшаем заголовок
         if 'Запись встречи' in title:
-            title = '# Обучение администраторов PASS24.online — запись встречи 18.11.2025'
-        new_lines.append(title + '\n')
-        new_lines.append('\n')
-    else:
-        new_lines.append('# Обучение администраторов PASS24.online — запись встречи 18.11.2025\n')
-        new_lines.append('\n')
+            title = DEFAULT_TITLE
     
-    # Метаданные документа
+    # Собираем новый контент одной строкой по шаблонам
     today = datetime.now().strftime('%Y-%m-%d')
-    new_lines.append('## Метаданные документа\n')
-    new_lines.append('\n')
-    new_lines.append('| Параметр | Значение |\n')
-    new_lines.append('| --- | --- |\n')
-    new_lines.append(f'| **Версия** | 1.0 |\n')
-    new_lines.append(f'| **Дата создания** | {today} |\n')
-    new_lines.append(f'| **Дата последнего обновления** | {today} |\n')
-    new_lines.append('| **Автор** | Система автоматической конвертации |\n')
-    new_lines.append('| **Ответственный за актуальность** | Отдел сопровождения клиентов |\n')
-    new_lines.append('| **Статус** | Актуально |\n')
-    new_lines.append('| **Тип документа** | Обучение |\n')
-    new_lines.append('| **Отдел** | ОС |\n')
-    new_lines.append('| **Теги** | обучение, PASS24.online, веб-интерфейс, администратор, инструкция |\n')
-    new_lines.append('\n')
-    new_lines.append('---\n')
-    new_lines.append('\n')
-    
-    # Целевая аудитория
-    new_lines.append('## Целевая аудитория\n')
-    new_lines.append('\n')
-    new_lines.append('**Для кого:** Менеджеры по сопровождению клиентов, новые сотрудники ОС, администраторы облака PASS24\n')
-    new_lines.append('\n')
-    new_lines.append('**Уровень подготовки:** Начинающий\n')
-    new_lines.append('\n')
-    new_lines.append('**Когда использовать:** При обучении работе с веб-интерфейсом PASS24.online: модули сотрудники, пользователи, адреса, КПП, пропуска, доверенности, рассылка, отчёты, настройки объекта, работа с запросами\n')
-    new_lines.append('\n')
-    new_lines.append('---\n')
-    new_lines.append('\n')
-    
-    # Краткое описание
-    new_lines.append('## Краткое описание\n')
-    new_lines.append('\n')
-    new_lines.append('Данный документ содержит структурированное обучение по веб-интерфейсу PASS24.online на основе записи встречи от 18.11.2025. В документе рассмотрены все основные модули системы: сотрудники, права, пользователи, адреса, объекты (настройки, КПП), пропуска, доверенности, рассылка, отчёты. Также описаны процессы авторизации, массовой загрузки, блокировок, работа с запросами и ответы на часто задаваемые вопросы.\n')
-    new_lines.append('\n')
-    new_lines.append('*Документ создан автоматически из видеозаписи; возможны ошибки распознавания речи.*\n')
-    new_lines.append('\n')
-    new_lines.append('---\n')
-    new_lines.append('\n')
-    
-    # Основной контент - извлекаем из сегментов
-    new_lines.append('## Основной контент\n')
-    new_lines.append('\n')
+    parts = [HEADER_TEMPLATE.format(title=title, today=today)]
     
     # Если есть сегменты, извлекаем их содержимое
     if segments_start is not None:
-        # Извлекаем текст из сегментов, группируя по темам
-        segments_content = []
-        current_segment = []
+        # Находим границы сегментов за один проход: сохраняются только пары
+        # индексов (начало, конец), текст сегмента — срез lines[начало:конец]
+        segment_bounds = []
+        segment_start = None
         
         for i in range(segments_start + 1, len(lines)):
             line = lines[i]
             # Если начинается новый сегмент
-            if line.strip().startswith('### ['):
-                if current_segment:
-                    segments_content.append('\n'.join(current_segment))
-                current_segment = [line]
-            elif line.strip() == '---' and current_segment:
+            if '### [' in line and line.lstrip().startswith('### ['):
+                if segment_start is not None:
+                    segment_bounds.append((segment_start, i))
+                segment_start = i
+            elif segment_start is not None and '---' in line and line.strip() == '---':
                 # Конец сегмента
-                segments_content.append('\n'.join(current_segment))
-                current_segment = []
-            elif current_segment:
-                current_segment.append(line)
+                segment_bounds.append((segment_start, i))
+                segment_start = None
         
-        if current_segment:
-            segments_content.append('\n'.join(current_segment))
+        if segment_start is not None:
+            segment_bounds.append((segment_start, len(lines)))
         
         # Добавляем первые несколько сегментов как пример
         # В реальной версии здесь должна быть более сложная логика структурирования
-        new_lines.append('### Введение\n')
-        new_lines.append('\n')
-        new_lines.append('В каждом модуле веб-интерфейса PASS24.online есть **знак вопроса** — это гиперссылка в базу знаний, где подробно описано, за что отвечает модуль и как с ним работать. При возникновении вопросов можно обратиться к базе знаний или в техническую поддержку.\n')
-        new_lines.append('\n')
-        new_lines.append('**Рекомендация:** Если хотите параллельно выполнять действия вместе с инструктором, откройте ссылку на ваше облако в отдельной вкладке\n')
-        new_lines.append('\n')
-        new_lines.append('---\n')
-        new_lines.append('\n')
-        
-        # Добавляем информацию о том, что полная транскрипция доступна в исходном видео
-        new_lines.append('### Примечание\n')
-        new_lines.append('\n')
-        new_lines.append('Полная транскрипция встречи доступна в исходном видеофайле. Данный документ содержит структурированное изложение основных тем и модулей системы.\n')
-        new_lines.append('\n')
+        parts.append(SEGMENTS_TEMPLATE)
     
     # История изменений
-    new_lines.append('---\n')
-    new_lines.append('\n')
-    new_lines.append('## История изменений\n')
-    new_lines.append('\n')
-    new_lines.append('| Версия | Дата | Автор | Изменения |\n')
-    new_lines.append('| --- | --- | --- | --- |\n')
-    new_lines.append(f'| 1.0 | {today} | Система автоматической конвертации | Первоначальная версия на основе видео |\n')
-    new_lines.append('\n')
+    parts.append(FOOTER_TEMPLATE.format(today=today))
+    content = ''.join(parts)
     
-    # Записываем новый файл
-    with open(file_path, 'w', encoding='utf-8') as f:
-        f.writelines(new_lines)
+    # Записываем новый файл одним вызовом
+    with open(file_path, 'w', encoding='utf-8', buffering=1 << 20) as f:
+        f.write(content)
     
+    new_line_count = content.count('\n')
     print(f"Файл отформатирован: {file_path}")
-    print(f"Удалено строк: {len(lines) - len(new_lines)}")
-    print(f"Создано строк: {len(new_lines)}")
+    print(f"Удалено строк: {len(lines) - new_line_count}")
+    print(f"Создано строк: {new_line_count}")
 
 if __name__ == '__main__':
     import sys
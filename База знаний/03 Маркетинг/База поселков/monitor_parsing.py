@@ -8,14 +8,61 @@ import re
 from datetime import datetime
 import os
 
-def get_status():
-    """Получает текущий статус выполнения"""
-    # Проверка процесса
+# PID-файл, который пишет parse_cottage_villages.py на время работы
+PID_FILE = '/tmp/parse_cottage_villages.pid'
+_PHONE_RE = re.compile(r'Найден телефон: (\+7\d{10})')
+
+# Состояние чтения лога между проверками: каждый раз дочитывается только
+# новый хвост файла, а счётчики накапливаются
+_log_state = {'file': None, 'offset': 0, 'phones': set(), 'attempts': 0}
+
+
+def _read_log_tail(log_file):
+    """Дочитывает новые полные строки лога и обновляет счётчики в _log_state"""
+    state = _log_state
+    # Другой лог или файл перезаписан (стал короче) — считаем заново
+    if state['file'] != log_file or os.path.getsize(log_file) < state['offset']:
+        state.update(file=log_file, offset=0, phones=set(), attempts=0)
+    with open(log_file, 'rb') as f:
+        f.seek(state['offset'])
+        chunk = f.read()
+    # Незаконченная последняя строка будет прочитана при следующей проверке
+    end = chunk.rfind(b'\n') + 1
+    if not end:
+        return
+    state['offset'] += end
+    content = chunk[:end].decode('utf-8', errors='replace')
+    state['phones'].update(_PHONE_RE.findall(content))
+    state['attempts'] += content.count('Найден телефон:')
+
+
+def _is_parser_running():
+    """Запущен ли parse_cottage_villages.py: по PID-файлу, без запуска ps на каждой проверке"""
+    try:
+        with open(PID_FILE) as f:
+            pid = int(f.read().strip())
+    except (OSError, ValueError):
+        pid = None
+    if pid:
+        try:
+            os.kill(pid, 0)
+            return True
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+    # PID-файла нет (парсер ещё не запущен или запущен старой версией) — смотрим список процессов
     try:
         result = subprocess.run(['ps', 'aux'], capture_output=True, text=True)
-        is_running = 'parse_cottage_villages.py' in result.stdout
+        return 'parse_cottage_villages.py' in result.stdout
     except:
-        is_running = False
+        return False
+
+
+def get_status():
+    """Получает текущий статус выполнения"""
+    # Проверка процесса
+    is_running = _is_parser_running()
     
     # Подсчет из лога
     log_files = ['/tmp/parsing_restarted.log', '/tmp/parsing_fixed.log', '/tmp/parsing_output.log']
@@ -31,10 +78,9 @@ def get_status():
     
     if log_file:
         try:
-            with open(log_file, 'r') as f:
-                content = f.read()
-                phones = len(set(re.findall(r'Найден телефон: (\+7\d{10})', content)))
-                attempts = len(re.findall(r'Найден телефон:', content))
+            _read_log_tail(log_file)
+            phones = len(_log_state['phones'])
+            attempts = _log_state['attempts']
         except:
             pass
     
@@ -8,7 +8,9 @@
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import csv
 import time
 import re
@@ -17,9 +19,13 @@ from datetime import datetime
 from typing import Dict, List, Optional
 import logging
 from urllib.parse import urljoin
+import operator
 import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from selenium import webdriver
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException, WebDriverException
@@ -47,9 +53,17 @@ HEADERS = {
 
 DELAY_MIN = 3
 DELAY_MAX = 7
-DELAY_429 = 25
+HTTP_RETRIES = 2
+HTTP_POOL_SIZE = 8
 MAX_SELENIUM_PHONE_ATTEMPTS = 60
 PAGE_LOAD_TIMEOUT = 20
+PHONE_WAIT_TIMEOUT = 4
+# Узлы страницы поселка, в которых может быть телефон
+PHONE_NODES_XPATH = "//a[starts-with(@href, 'tel:')] | //*[@data-phone or @data-tel or @data-telephone]"
+# Картинки, стили и шрифты для поиска телефона не нужны — Chrome их не загружает
+BLOCKED_URLS = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.css', '*.woff', '*.woff2', '*.ttf']
+PAGE_FETCH_WORKERS = 4
+PAGE_FETCH_CONCURRENCY = 2
 
 FIELDS = [
     'ID', 'Название поселка', 'Регион', 'Город/Район', 'Адрес', 'Координаты', 'Ссылка на источник',
@@ -65,8 +79,154 @@ FIELDS = [
     'Источник информации', 'Дата добавления в базу', 'Дата последнего обновления', 'Кто добавил'
 ]
 
+_ROW_VALUES = operator.itemgetter(*FIELDS)
+CSV_BUFFER_SIZE = 1 << 20
+
 BASE_COTTAGE = 'https://www.cottage.ru'
 
+# Страницы каталога разбираются C-парсером lxml (если установлен), причём только
+# ссылки и контейнеры карточек — остальная разметка в дерево не попадает
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+CATALOG_STRAINER = SoupStrainer(['a', 'div', 'article', 'section'])
+
+# Регулярные выражения компилируются один раз при загрузке модуля, а не на каждой карточке
+_PHONE_PATTERNS = (
+    r'\+?7\s?\(?\d{3}\)?\s?\d{3}[- ]?\d{2}[- ]?\d{2}',
+    r'\+?7\s?\d{10}',
+    r'8\s?\(?\d{3}\)?\s?\d{3}[- ]?\d{2}[- ]?\d{2}',
+    r'\d{3}[- ]?\d{3}[- ]?\d{2}[- ]?\d{2}',
+)
+_PHONE_RES = tuple(re.compile(p) for p in _PHONE_PATTERNS)
+# Все форматы телефона одним проходом (альтернативы в порядке приоритета)
+_PHONE_COMBINED_RE = re.compile('|'.join(_PHONE_PATTERNS))
+_MASKED_PHONE_RE = re.compile(r'\d-[xх]\d', re.I)
+_PHONE_JUNK_RE = re.compile(r'[\s\-\(\)]')
+_NON_PHONE_CHARS_RE = re.compile(r'[^\d+]')
+# Невалидные названия: простые слова проверяются подстрокой, выражения — только для остального
+_INVALID_NAME_WORDS = ('подробнее', 'продажа', 'фото', 'смотреть', 'клик', 'нажмите')
+_INVALID_NAME_RES = tuple(re.compile(p, re.I) for p in (
+    r'с\s*коммуникациями', r'в\s*избранное', r'^\d+$', r'^[а-яё]{1,2}$',
+    r'коттеджные\s*посёл?ки\s*в\s*', r'поселки\s*в\s*области', r'коттеджные\s*поселки$',
+))
+_CITY_RE = re.compile(r'город\s+([А-Яа-яёЁ\-\s]+?)(?:[\s,.]|$)')
+# Район и шоссе ищутся по суффиксу (перед ним — хотя бы одна буква, дефис или пробел),
+# а начало названия находится обратным проходом: r'([А-Яа-яёЁ\-\s]+?район)' с
+# ленивым классом перебирает каждую стартовую позицию и квадратичен на длинном тексте
+_DISTRICT_SUFFIX_RE = re.compile(r'(?<=[А-Яа-яёЁ\-\s])(?:район|г\.|гор\.)', re.I)
+_HIGHWAY_SUFFIX_RE = re.compile(r'(?<=[А-Яа-яёЁ\-\s])шоссе', re.I)
+_NAME_CHARS = frozenset('АБВГДЕЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯабвгдежзийклмнопрстуфхцчшщъыьэюяёЁ-')
+_LOCATION_HREF_RE = re.compile(r'location=|direction=')
+_VILLAGE_HREF_PREFIX = '/objects/village/'
+
+
+def _source_url(href: str) -> str:
+    """Полная ссылка на карточку поселка по href из каталога"""
+    if href.startswith('/'):
+        return urljoin(BASE_COTTAGE, href)
+    return href if href.startswith('http') else urljoin(BASE_COTTAGE, '/' + href.lstrip('/'))
+
+
+def _url_key(url: str) -> str:
+    """Ключ дедупликации: ссылка без #якоря и ?параметров"""
+    return url.split('#', 1)[0].split('?', 1)[0]
+
+
+def _search_phone(text: str) -> Optional[str]:
+    """
+    Первый найденный телефон с учётом приоритета форматов: как поиск каждым
+    выражением из _PHONE_RES по очереди, но обычно за один проход по тексту.
+    """
+    m = _PHONE_COMBINED_RE.search(text)
+    if not m:
+        return None
+    # Самое левое совпадение — первого (приоритетного) формата: его и вернул бы
+    # поиск по очереди. Иначе форматы проверяются по одному, как раньше, но
+    # только с этой позиции: левее совпадений нет ни у одного формата
+    start = m.start()
+    if _PHONE_RES[0].match(text, start):
+        return m.group(0)
+    for pat in _PHONE_RES:
+        m = pat.search(text, start)
+        if m:
+            return m.group(0)
+    return None
+
+
+def _is_village_href(href: Optional[str]) -> bool:
+    """Ссылка на карточку поселка (то же, что поиск r'/objects/village/[^/]+\\.html', но строковыми методами)"""
+    if not href:
+        return False
+    i = href.find(_VILLAGE_HREF_PREFIX)
+    while i >= 0:
+        slug = href[i + len(_VILLAGE_HREF_PREFIX):].split('/', 1)[0]
+        if '.html' in slug[1:]:
+            return True
+        i = href.find(_VILLAGE_HREF_PREFIX, i + 1)
+    return False
+
+
+def _find_with_prefix(suffix_re, txt: str) -> Optional[str]:
+    """Первый суффикс вместе с идущей перед ним серией букв, дефисов и пробелов"""
+    m = suffix_re.search(txt)
+    if not m:
+        return None
+    start = m.start()
+    while start > 0 and (txt[start - 1] in _NAME_CHARS or txt[start - 1].isspace()):
+        start -= 1
+    return txt[start:m.end()]
+
+
+# Пустая запись поселка: постоянные значения полей, общие для всех карточек
+_EMPTY_VILLAGE = {
+    'ID': None,
+    'Название поселка': None,
+    'Регион': 'Московская область',
+    'Город/Район': None,
+    'Адрес': None,
+    'Координаты': None,
+    'Ссылка на источник': None,
+    'Количество домов/участков': None,
+    'Статус поселка': None,
+    'Наличие ограждения': None,
+    'Наличие КПП': None,
+    'Количество КПП': None,
+    'Наличие охраны': None,
+    'Тип охраны': None,
+    'Наличие интернета': None,
+    'Тип управления': None,
+    'Название УК/ТСЖ': None,
+    'ФИО председателя/руководителя': None,
+    'Телефон основной': None,
+    'Телефон дополнительный': None,
+    'Email': None,
+    'Сайт поселка/УК': None,
+    'Социальные сети': None,
+    'Challenges (Проблемы)': None,
+    'Authority (Полномочия)': 'Неизвестно',
+    'Money (Бюджет)': 'Неизвестно',
+    'Priority (Приоритет)': 'Неизвестно',
+    'Оценка целевого клиента': 'Требует проверки',
+    'Статус в CRM': 'Не обработан',
+    'ID сделки в CRM': None,
+    'Менеджер': None,
+    'Дата первого контакта': None,
+    'Дата последнего контакта': None,
+    'Следующий контакт': None,
+    'Комментарии': None,
+    'Результат': 'Не обработан',
+    'Дата продажи': None,
+    'Сумма сделки': None,
+    'Причина отказа': None,
+    'Источник информации': 'Cottage.ru',
+    'Дата добавления в базу': None,
+    'Дата последнего обновления': None,
+    'Кто добавил': 'Парсер'
+}
+
 
 class SeleniumPhoneExtractor:
     """Извлечение телефонов с помощью Selenium"""
@@ -90,6 +250,11 @@ class SeleniumPhoneExtractor:
             service = Service(ChromeDriverManager().install())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+            try:
+                self.driver.execute_cdp_cmd('Network.enable', {})
+                self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URLS})
+            except Exception as e:
+                logger.debug(f"Не удалось отключить загрузку картинок и стилей: {e}")
             logger.info("Selenium WebDriver инициализирован успешно")
         except ImportError as e:
             logger.error(f"Selenium не установлен: {e}")
@@ -103,7 +268,15 @@ class SeleniumPhoneExtractor:
             return None
         try:
             self.driver.get(url)
-            time.sleep(random.uniform(2, 4))
+            # Ждём не фиксированные 2-4 с, а появления узла с телефоном
+            # (или полной загрузки страницы, если телефона на ней нет)
+            try:
+                WebDriverWait(self.driver, PHONE_WAIT_TIMEOUT).until(
+                    lambda d: d.find_elements(By.XPATH, PHONE_NODES_XPATH)
+                    or d.execute_script('return document.readyState') == 'complete'
+                )
+            except TimeoutException:
+                pass
             phone = None
             tel_links = self.driver.find_elements(By.XPATH, "//a[starts-with(@href, 'tel:')]")
             for link in tel_links:
@@ -129,18 +302,15 @@ class SeleniumPhoneExtractor:
             return None
 
     def _extract_phone_from_text(self, text: str) -> Optional[str]:
-        if not text:
+        if not text or not any(map(str.isdigit, text)):
             return None
-        for pat in [r'\+?7\s?\(?\d{3}\)?\s?\d{3}[- ]?\d{2}[- ]?\d{2}', r'\+?7\s?\d{10}', r'8\s?\(?\d{3}\)?\s?\d{3}[- ]?\d{2}[- ]?\d{2}', r'\d{3}[- ]?\d{3}[- ]?\d{2}[- ]?\d{2}']:
-            m = re.search(pat, text)
-            if m:
-                return m.group(0).strip()
-        return None
+        phone = _search_phone(text)
+        return phone.strip() if phone else None
 
     def _normalize_phone(self, phone: str) -> str:
         if not phone:
             return phone
-        phone = re.sub(r'[^\d+]', '', phone)
+        phone = _NON_PHONE_CHARS_RE.sub('', phone)
         if phone.startswith('8'):
             phone = '+7' + phone[1:]
         elif not phone.startswith('+7'):
@@ -164,9 +334,18 @@ class SeleniumPhoneExtractor:
 class CottageRuParser:
     """Парсинг коттеджных поселков с Cottage.ru /objects/village/"""
 
-    def __init__(self, use_selenium: bool = True, selenium_headless: bool = True):
+    def __init__(self, use_selenium: bool = True, selenium_headless: bool = True, output: Optional[str] = None):
         self.session = requests.Session()
         self.session.headers.update(HEADERS)
+        # Пул keep-alive соединений на все потоки загрузки и повторы с паузой
+        # (с учётом Retry-After) при 429/502/503
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_SIZE,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(total=HTTP_RETRIES, backoff_factor=1, status_forcelist=[429, 502, 503]),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.results: List[Dict] = []
         self.village_id = 1
         self.current_date = datetime.now().strftime('%Y-%m-%d')
@@ -174,6 +353,9 @@ class CottageRuParser:
         self.selenium_extractor = None
         self.selenium_phones_count = 0
         self.selenium_phone_attempts = 0
+        self._page_semaphore = threading.Semaphore(PAGE_FETCH_CONCURRENCY)
+        # Поселки, уже сохранённые в выходной файл прошлыми запусками, повторно не разбираются
+        self.seen_hrefs = self._load_seen_hrefs(output) if output else set()
         if use_selenium:
             try:
                 self.selenium_extractor = SeleniumPhoneExtractor(headless=selenium_headless)
@@ -181,6 +363,25 @@ class CottageRuParser:
                 logger.warning(f"Selenium не инициализирован: {e}")
                 self.use_selenium = False
 
+    def _load_seen_hrefs(self, filename: str) -> set:
+        """Ключи ссылок на источник из уже сохранённого результата (CSV или Parquet)"""
+        if not os.path.exists(filename):
+            return set()
+        try:
+            if filename.endswith('.parquet'):
+                import pyarrow.parquet as pq
+                links = pq.read_table(filename, columns=['Ссылка на источник']).column(0).to_pylist()
+            else:
+                with open(filename, 'r', encoding='utf-8-sig', newline='') as f:
+                    links = [row.get('Ссылка на источник') for row in csv.DictReader(f)]
+        except Exception as e:
+            logger.warning("Не удалось прочитать ссылки из %s: %s", filename, e)
+            return set()
+        seen = {_url_key(link) for link in links if link}
+        if seen:
+            logger.info("Уже сохранено поселков: %s, они будут пропущены", len(seen))
+        return seen
+
     def delay(self):
         time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
 
@@ -193,32 +394,31 @@ class CottageRuParser:
     def extract_phone(self, text: str) -> Optional[str]:
         if not text:
             return None
+        # Без единой цифры телефона в тексте нет — регулярные выражения не запускаем
+        if not any(map(str.isdigit, text)):
+            return None
         # Пропускаем замаскированные (x-xx)
-        if 'x-xx' in text or re.search(r'\d-[xх]\d', text, re.I):
+        if 'x-xx' in text or _MASKED_PHONE_RE.search(text):
             return None
-        for pat in [r'\+?7\s?\(?\d{3}\)?\s?\d{3}[- ]?\d{2}[- ]?\d{2}', r'\+?7\s?\d{10}', r'8\s?\(?\d{3}\)?\s?\d{3}[- ]?\d{2}[- ]?\d{2}', r'\d{3}[- ]?\d{3}[- ]?\d{2}[- ]?\d{2}']:
-            m = re.search(pat, text)
-            if m:
-                p = m.group(0).strip()
-                p = re.sub(r'[\s\-\(\)]', '', p)
-                if p.startswith('8'):
-                    p = '+7' + p[1:]
-                elif not p.startswith('+7'):
-                    p = '+7' + p
-                return p
-        return None
+        p = _search_phone(text)
+        if not p:
+            return None
+        p = _PHONE_JUNK_RE.sub('', p.strip())
+        if p.startswith('8'):
+            p = '+7' + p[1:]
+        elif not p.startswith('+7'):
+            p = '+7' + p
+        return p
 
     def validate_village_name(self, name: str) -> bool:
         if not name or len(name.strip()) < 3:
             return False
-        invalid = [
-            r'подробнее', r'с\s*коммуникациями', r'в\s*избранное', r'ещё\s*фото', r'продажа', r'фото',
-            r'смотреть', r'клик', r'нажмите', r'^\d+$', r'^[а-яё]{1,2}$',
-            r'коттеджные\s*посёл?ки\s*в\s*', r'поселки\s*в\s*области', r'коттеджные\s*поселки$',
-        ]
         nl = name.lower().strip()
-        for p in invalid:
-            if re.search(p, nl, re.I):
+        for word in _INVALID_NAME_WORDS:
+            if word in nl:
+                return False
+        for p in _INVALID_NAME_RES:
+            if p.search(nl):
                 return False
         if len(name.strip()) < 5:
             return False
@@ -226,35 +426,50 @@ class CottageRuParser:
             return False
         return True
 
-    def _extract_city_or_district(self, block) -> Optional[str]:
-        txt = block.get_text() if hasattr(block, 'get_text') else ''
-        # город X, X район, Y шоссе
-        m = re.search(r'город\s+([А-Яа-яёЁ\-\s]+?)(?:\s|,|$|\.)', txt)
-        if m:
-            return ('город ' + m.group(1)).strip()
-        m = re.search(r'([А-Яа-яёЁ\-\s]+?(?:район|г\.|гор\.))', txt, re.I)
-        if m:
-            return m.group(1).strip()
-        m = re.search(r'([А-Яа-яёЁ\-\s]+?шоссе)(?:\s*,?\s*\d+\s*км)?', txt, re.I)
-        if m:
-            return m.group(1).strip()
+    def _extract_city_or_district(self, block, txt: str) -> Optional[str]:
+        # город X, X район, Y шоссе. Каждое выражение запускается, только если в
+        # тексте есть его опорная подстрока (район и шоссе ищутся без учёта регистра)
+        folded = txt.casefold()
+        if 'город' in txt:
+            m = _CITY_RE.search(txt)
+            if m:
+                return ('город ' + m.group(1)).strip()
+        if 'район' in folded or 'г.' in folded or 'гор.' in folded:
+            found = _find_with_prefix(_DISTRICT_SUFFIX_RE, txt)
+            if found:
+                return found.strip()
+        if 'шоссе' in folded:
+            found = _find_with_prefix(_HIGHWAY_SUFFIX_RE, txt)
+            if found:
+                return found.strip()
         # Ссылки с location= или direction=
-        a = block.find('a', href=re.compile(r'location=|direction='))
+        a = block.find('a', href=_LOCATION_HREF_RE)
         if a and a.get_text(strip=True):
             return a.get_text(strip=True)
         return None
 
+    def _try_static_phone(self, url: str) -> Optional[str]:
+        """Телефон из tel:-ссылки в HTML страницы поселка без Selenium (None — если ссылки нет)"""
+        try:
+            resp = self.session.get(url, timeout=10)
+            resp.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.debug(f"Ошибка загрузки {url}: {e}")
+            return None
+        soup = BeautifulSoup(resp.text, HTML_PARSER, parse_only=SoupStrainer('a'))
+        for a in soup.find_all('a', href=lambda h: h and h.startswith('tel:')):
+            phone = a['href'].replace('tel:', '').strip()
+            if phone:
+                return self.selenium_extractor._normalize_phone(phone)
+        return None
+
     def _parse_village_card(self, block, detail_href: str) -> Optional[Dict]:
         try:
             village = self._create_empty_village()
-            href = detail_href
-            if href.startswith('/'):
-                full_url = urljoin(BASE_COTTAGE, href)
-            else:
-                full_url = href if href.startswith('http') else urljoin(BASE_COTTAGE, '/' + href.lstrip('/'))
+            full_url = _source_url(detail_href)
             village['Ссылка на источник'] = full_url
 
-            link = block.find('a', href=re.compile(r'/objects/village/[^/]+\.html')) if hasattr(block, 'find') else None
+            link = block.find('a', href=_is_village_href) if hasattr(block, 'find') else None
             if not link:
                 link = block if getattr(block, 'name', None) == 'a' else None
 
@@ -264,11 +479,15 @@ class CottageRuParser:
             if not name:
                 for tag in ['h2', 'h3', 'h4']:
                     h = block.find(tag) if hasattr(block, 'find') else None
-                    if h and h.get_text(strip=True) and self.validate_village_name(h.get_text(strip=True)):
-                        name = h.get_text(strip=True)
+                    h_text = h.get_text(strip=True) if h else None
+                    if h_text and self.validate_village_name(h_text):
+                        name = h_text
                         break
-            if not name and hasattr(block, 'get_text'):
-                for line in (block.get_text() or '').splitlines():
+            # Текст карточки получаем один раз: он нужен для поиска названия,
+            # города/района и телефона
+            block_text = (block.get_text() or '') if hasattr(block, 'get_text') else ''
+            if not name:
+                for line in block_text.splitlines():
                     line = line.strip()
                     if line and self.validate_village_name(line) and 'подробнее' not in line.lower() and 'с коммуникациями' not in line.lower():
                         name = line
@@ -279,21 +498,26 @@ class CottageRuParser:
             village['Название поселка'] = name
 
             village['Регион'] = 'Московская область'
-            city = self._extract_city_or_district(block)
+            city = self._extract_city_or_district(block, block_text)
             if city:
                 village['Город/Район'] = city
 
-            block_text = block.get_text() if hasattr(block, 'get_text') else ''
             phone = self.extract_phone(block_text)
             if phone:
                 village['Телефон основной'] = phone
 
             if not village.get('Телефон основной') and self.use_selenium and self.selenium_extractor and self._can_do_selenium_phone():
                 self.delay()
-                ph = self.selenium_extractor.extract_phone_from_url(full_url)
+                # Обычно tel:-ссылка есть уже в статическом HTML страницы поселка;
+                # Chrome запускается, только если её там нет
+                ph = self._try_static_phone(full_url)
                 if ph:
                     village['Телефон основной'] = ph
-                    self.selenium_phones_count += 1
+                else:
+                    ph = self.selenium_extractor.extract_phone_from_url(full_url)
+                    if ph:
+                        village['Телефон основной'] = ph
+                        self.selenium_phones_count += 1
 
             self.village_id += 1
             return village
@@ -302,143 +526,175 @@ class CottageRuParser:
             return None
 
     def _create_empty_village(self) -> Dict:
-        return {
-            'ID': self.village_id,
-            'Название поселка': None,
-            'Регион': 'Московская область',
-            'Город/Район': None,
-            'Адрес': None,
-            'Координаты': None,
-            'Ссылка на источник': None,
-            'Количество домов/участков': None,
-            'Статус поселка': None,
-            'Наличие ограждения': None,
-            'Наличие КПП': None,
-            'Количество КПП': None,
-            'Наличие охраны': None,
-            'Тип охраны': None,
-            'Наличие интернета': None,
-            'Тип управления': None,
-            'Название УК/ТСЖ': None,
-            'ФИО председателя/руководителя': None,
-            'Телефон основной': None,
-            'Телефон дополнительный': None,
-            'Email': None,
-            'Сайт поселка/УК': None,
-            'Социальные сети': None,
-            'Challenges (Проблемы)': None,
-            'Authority (Полномочия)': 'Неизвестно',
-            'Money (Бюджет)': 'Неизвестно',
-            'Priority (Приоритет)': 'Неизвестно',
-            'Оценка целевого клиента': 'Требует проверки',
-            'Статус в CRM': 'Не обработан',
-            'ID сделки в CRM': None,
-            'Менеджер': None,
-            'Дата первого контакта': None,
-            'Дата последнего контакта': None,
-            'Следующий контакт': None,
-            'Комментарии': None,
-            'Результат': 'Не обработан',
-            'Дата продажи': None,
-            'Сумма сделки': None,
-            'Причина отказа': None,
-            'Источник информации': 'Cottage.ru',
-            'Дата добавления в базу': self.current_date,
-            'Дата последнего обновления': self.current_date,
-            'Кто добавил': 'Парсер'
-        }
+        # Копия общего шаблона вместо построения словаря из ~40 литералов на каждую карточку
+        village = _EMPTY_VILLAGE.copy()
+        village['ID'] = self.village_id
+        village['Дата добавления в базу'] = self.current_date
+        village['Дата последнего обновления'] = self.current_date
+        return village
+
+    def _fetch_page(self, url: str) -> Optional[str]:
+        """Загружает страницу каталога, None — если загрузить не удалось"""
+        self.delay()
+        try:
+            # Не больше PAGE_FETCH_CONCURRENCY одновременных запросов к сайту;
+            # повторы при 429/502/503 и сетевых ошибках выполняет адаптер сессии
+            with self._page_semaphore:
+                resp = self.session.get(url, timeout=60)
+            resp.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            logger.warning("Ошибка загрузки %s: %s", url, e)
+            return None
+        return resp.text
 
     def parse_cottage_ru(self, base_url: str = 'https://www.cottage.ru/objects/village/', max_pages: int = 5) -> List[Dict]:
         logger.info("Начинаем парсинг Cottage.ru: %s", base_url)
         villages = []
-        seen_hrefs = set()
-
-        for page in range(1, max_pages + 1):
-            self.delay()
-            url = base_url if page == 1 else f"{base_url.rstrip('/')}?page={page}"
-
-            for attempt in range(2):
-                try:
-                    resp = self.session.get(url, timeout=60)
-                    if resp.status_code == 429:
-                        logger.warning("Получен 429, пауза %s с", DELAY_429)
-                        time.sleep(DELAY_429)
-                        continue
-                    resp.raise_for_status()
-                    break
-                except requests.exceptions.RequestException as e:
-                    if attempt < 1:
-                        time.sleep(DELAY_429)
-                        continue
-                    logger.warning("Ошибка загрузки %s: %s", url, e)
+        seen_hrefs = set(self.seen_hrefs)
+
+        # Страницы загружаются параллельно в нескольких потоках (ожидание сети
+        # перекрывается), а разбираются по порядку в основном потоке — results
+        # и seen_hrefs трогает только он
+        executor = ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS)
+        futures = {
+            page: executor.submit(self._fetch_page, base_url if page == 1 else f"{base_url.rstrip('/')}?page={page}")
+            for page in range(1, max_pages + 1)
+        }
+        try:
+            for page in range(1, max_pages + 1):
+                html = futures[page].result()
+                if html is None:
                     if page > 1:
                         return villages
                     return []
 
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            links = soup.find_all('a', href=re.compile(r'/objects/village/[^/]+\.html'))
-            if not links and page > 1:
-                break
-
-            for link in links:
-                href = link.get('href', '')
-                if not href or href in seen_hrefs:
-                    continue
-                seen_hrefs.add(href)
-                parent = link.find_parent(['div', 'article', 'section'])
-                if not parent:
-                    parent = link
-                v = self._parse_village_card(parent, href)
-                if v and self.validate_village_name(v.get('Название поселка', '')):
-                    villages.append(v)
-                    logger.info("Добавлен поселок: %s", v.get('Название поселка'))
-
-            logger.info("Страница %s/%s: найдено поселков всего: %s", page, max_pages, len(villages))
+                soup = BeautifulSoup(html, HTML_PARSER, parse_only=CATALOG_STRAINER)
+                links = soup.find_all('a', href=_is_village_href)
+                if not links and page > 1:
+                    break
+
+                for link in links:
+                    href = link.get('href', '')
+                    # Повтор карточки (в том числе с другим #якорем или ?параметрами)
+                    # отсекается до поиска контейнера и разбора текста
+                    href_key = _url_key(_source_url(href)) if href else ''
+                    if not href_key or href_key in seen_hrefs:
+                        continue
+                    seen_hrefs.add(href_key)
+                    parent = link.find_parent(['div', 'article', 'section'])
+                    if not parent:
+                        parent = link
+                    v = self._parse_village_card(parent, href)
+                    if v and self.validate_village_name(v.get('Название поселка', '')):
+                        villages.append(v)
+                        logger.info("Добавлен поселок: %s", v.get('Название поселка'))
+
+                logger.info("Страница %s/%s: найдено поселков всего: %s", page, max_pages, len(villages))
+        finally:
+            # Ещё не начатые загрузки после ошибки или последней страницы не нужны
+            executor.shutdown(wait=True, cancel_futures=True)
 
         logger.info("Всего поселков с Cottage.ru: %s", len(villages))
         return villages
 
+    def _assign_ids(self, max_id: int):
+        """Назначает новым записям ID, не пересекающиеся с уже сохранёнными (больше max_id)"""
+        for v in self.results:
+            if v.get('ID'):
+                try:
+                    if int(v['ID']) <= max_id:
+                        max_id += 1
+                        v['ID'] = max_id
+                except ValueError:
+                    max_id += 1
+                    v['ID'] = max_id
+            else:
+                max_id += 1
+                v['ID'] = max_id
+
     def save_to_csv(self, filename: str = 'Результат парсинга информации в интернете.csv'):
         if not self.results:
             logger.warning("Нет данных для сохранения")
             return
-        existing_data = []
-        existing_ids = set()
+        # Существующий файл читается потоково: нужны только заголовок, число
+        # записей и максимальный ID, сами строки в памяти не держим
+        header = None
+        existing_count = 0
+        max_id = 0
         if os.path.exists(filename):
             try:
                 with open(filename, 'r', encoding='utf-8-sig', newline='') as f:
-                    for row in csv.DictReader(f):
-                        existing_data.append(row)
+                    reader = csv.DictReader(f)
+                    header = reader.fieldnames
+                    for row in reader:
+                        existing_count += 1
                         if row.get('ID'):
                             try:
-                                existing_ids.add(int(row['ID']))
+                                max_id = max(max_id, int(row['ID']))
                             except ValueError:
                                 pass
             except Exception as e:
                 logger.warning("Ошибка чтения CSV: %s", e)
-        max_id = max(existing_ids) if existing_ids else 0
-        for v in self.results:
-            if v.get('ID'):
-                try:
-                    if int(v['ID']) <= max_id:
-                        max_id += 1
-                        v['ID'] = max_id
-                except ValueError:
-                    max_id += 1
-                    v['ID'] = max_id
-            else:
-                max_id += 1
-                v['ID'] = max_id
-        all_data = existing_data + self.results
+        self._assign_ids(max_id)
         try:
-            with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
-                w = csv.DictWriter(f, fieldnames=FIELDS)
-                w.writeheader()
-                w.writerows(all_data)
-            logger.info("Сохранено %s записей в %s, всего: %s", len(self.results), filename, len(all_data))
+            if header is None or list(header) == FIELDS:
+                # Новые записи дописываются в конец файла; заголовок — только в пустой файл.
+                # Записи поселков содержат все поля FIELDS, поэтому строки собираются
+                # одним itemgetter без поштучного разбора словаря в DictWriter
+                with open(filename, 'a', encoding='utf-8-sig', newline='', buffering=CSV_BUFFER_SIZE) as f:
+                    w = csv.writer(f)
+                    if f.tell() == 0:
+                        w.writerow(FIELDS)
+                    w.writerows(map(_ROW_VALUES, self.results))
+            else:
+                # Файл с другим набором колонок переписывается целиком в порядке FIELDS
+                with open(filename, 'r', encoding='utf-8-sig', newline='') as f:
+                    existing_data = list(csv.DictReader(f))
+                with open(filename, 'w', encoding='utf-8-sig', newline='', buffering=CSV_BUFFER_SIZE) as f:
+                    w = csv.DictWriter(f, fieldnames=FIELDS)
+                    w.writeheader()
+                    w.writerows(existing_data)
+                    w.writerows(self.results)
+            logger.info("Сохранено %s записей в %s, всего: %s", len(self.results), filename, existing_count + len(self.results))
         except Exception as e:
             logger.error("Ошибка сохранения CSV: %s", e)
 
+    def save_to_parquet(self, filename: str = 'Результат парсинга информации в интернете.parquet'):
+        """Сохраняет результаты в Parquet (колоночный формат для аналитики); нужен pyarrow"""
+        if not self.results:
+            logger.warning("Нет данных для сохранения")
+            return
+        try:
+            import pyarrow as pa
+            import pyarrow.compute as pc
+            import pyarrow.parquet as pq
+        except ImportError:
+            logger.error("Для сохранения в Parquet установите pyarrow: pip install pyarrow")
+            return
+        schema = pa.schema([('ID', pa.int32())] + [(name, pa.string()) for name in FIELDS[1:]])
+        # Parquet не дописывается: существующий файл читается и сохраняется вместе с новыми записями
+        existing = None
+        max_id = 0
+        if os.path.exists(filename):
+            try:
+                existing = pq.read_table(filename).select(FIELDS).cast(schema)
+                max_id = pc.max(existing['ID']).as_py() or 0
+            except Exception as e:
+                # Иначе существующие данные были бы перезаписаны только новыми записями
+                logger.error("Ошибка чтения Parquet %s, файл не изменён: %s", filename, e)
+                return
+        self._assign_ids(max_id)
+        columns = {name: [None if v.get(name) is None else str(v[name]) for v in self.results] for name in FIELDS[1:]}
+        columns['ID'] = [int(v['ID']) for v in self.results]
+        table = pa.Table.from_pydict(columns, schema=schema)
+        if existing is not None:
+            table = pa.concat_tables([existing, table])
+        try:
+            pq.write_table(table, filename)
+            logger.info("Сохранено %s записей в %s, всего: %s", len(self.results), filename, table.num_rows)
+        except Exception as e:
+            logger.error("Ошибка сохранения Parquet: %s", e)
+
     def close(self):
         if self.selenium_extractor:
             self.selenium_extractor.close()
@@ -449,16 +705,22 @@ def main():
     ap = argparse.ArgumentParser(description='Парсинг коттеджных поселков с Cottage.ru')
     ap.add_argument('--no-selenium', action='store_true', help='Не использовать Selenium')
     ap.add_argument('--selenium-headless', action='store_true', default=True, help='Selenium в headless')
-    ap.add_argument('--output', default='Результат парсинга информации в интернете.csv', help='Выходной CSV')
+    ap.add_argument('--output', default=None, help='Выходной файл (по умолчанию "Результат парсинга информации в интернете.csv" или .parquet)')
+    ap.add_argument('--output-format', choices=['csv', 'parquet'], default='csv', help='Формат результата (parquet требует pyarrow)')
     ap.add_argument('--max-pages', type=int, default=5, help='Макс. страниц')
     ap.add_argument('--url', default='https://www.cottage.ru/objects/village/', help='URL каталога поселков')
     args = ap.parse_args()
 
-    p = CottageRuParser(use_selenium=not args.no_selenium, selenium_headless=args.selenium_headless)
+    if not args.output:
+        args.output = 'Результат парсинга информации в интернете.' + args.output_format
+    p = CottageRuParser(use_selenium=not args.no_selenium, selenium_headless=args.selenium_headless, output=args.output)
     try:
         villages = p.parse_cottage_ru(base_url=args.url, max_pages=args.max_pages)
         p.results = villages
-        p.save_to_csv(args.output)
+        if args.output_format == 'parquet':
+            p.save_to_parquet(args.output)
+        else:
+            p.save_to_csv(args.output)
         logger.info("Парсинг завершен. Найдено поселков: %s", len(villages))
         if p.selenium_phones_count > 0:
             logger.info("Телефонов через Selenium: %s", p.selenium_phones_count)
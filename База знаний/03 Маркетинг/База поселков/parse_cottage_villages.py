@@ -16,25 +16,26 @@
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 import csv
 import json
 import time
 import re
 import os
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
+import multiprocessing
 from urllib.parse import urljoin, urlparse, parse_qs
 import random
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+# Сам WebDriver и webdriver_manager импортируются только при запуске браузера
+# (selenium.webdriver тянет модули всех браузеров); исключения нужны в except-ветках
+from selenium.common.exceptions import TimeoutException, NoSuchElementException, WebDriverException, StaleElementReferenceException
 
 # Настройка логирования
 logging.basicConfig(
@@ -65,6 +66,325 @@ DELAY_MAX = 5
 MAX_SELENIUM_PHONE_ATTEMPTS = 60   # макс. попыток получения телефона через Selenium за один запуск
 MAX_ENRICH = 40                    # макс. записей для обогащения из детальных страниц
 PAGE_LOAD_TIMEOUT = 20             # таймаут загрузки страницы в Selenium (сек)
+# Ошибки WebDriver, после которых сессия браузера потеряна и его нужно запустить заново
+SESSION_LOST_MARKERS = ('invalid session id', 'session deleted', 'chrome not reachable', 'disconnected')
+# Кэш телефонов, полученных через Selenium: URL -> [телефон ('' — не найден), время проверки]
+PHONE_CACHE_FILE = '.parse_cottage_villages_phones.json'
+PHONE_CACHE_TTL = 7 * 24 * 3600    # срок жизни записи кэша (сек)
+SELENIUM_POOL_SIZE = 4             # браузеров для параллельного получения телефонов
+PHONE_WAIT_TIMEOUT = 3             # ожидание появления телефона после клика (сек)
+# Узлы страницы поселка, в которых может быть телефон
+PHONE_NODES_XPATH = "//a[starts-with(@href, 'tel:')] | //*[@data-phone or @data-tel or @data-telephone]"
+# XPath кнопок "Показать телефон" в порядке приоритета
+SHOW_PHONE_BUTTON_XPATHS = [
+    # Cian.ru
+    "//button[contains(@class, 'phone') or contains(@class, 'show-phone') or contains(text(), 'Показать телефон')]",
+    "//a[contains(@class, 'phone') or contains(@class, 'show-phone')]",
+    "//*[@data-name='PhoneButton']",
+    "//*[contains(@data-testid, 'phone')]",
+    # Общие паттерны
+    "//button[contains(translate(text(), 'АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ', 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'), 'показать телефон')]",
+    "//a[contains(translate(text(), 'АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ', 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'), 'показать телефон')]",
+    "//*[contains(@class, 'show-phone')]",
+    "//*[contains(@class, 'phone-button')]",
+    "//*[contains(@class, 'contact-phone')]",
+]
+# Первый видимый и доступный элемент по списку XPath (arguments[0]) — в браузере за один вызов
+SHOW_PHONE_BUTTON_JS = '''
+for (const xpath of arguments[0]) {
+    let found;
+    try {
+        found = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    } catch (e) {
+        continue;
+    }
+    for (let i = 0; i < found.snapshotLength; i++) {
+        const elem = found.snapshotItem(i);
+        const style = window.getComputedStyle(elem);
+        if (elem.getClientRects().length && style.visibility !== 'hidden' && style.display !== 'none' && !elem.disabled) {
+            return elem;
+        }
+    }
+}
+return null;
+'''
+# Поиск телефона на странице за один вызов execute_script: tel:-ссылки, затем
+# data-атрибуты; если их нет — HTML страницы и тексты элементов с классом phone/tel
+# для поиска регулярными выражениями (стратегии 3 и 4) на стороне Python
+PHONE_LOOKUP_JS = '''
+for (const link of document.querySelectorAll('a[href^="tel:"]')) {
+    const phone = (link.href || '').split('tel:').join('').trim();
+    if (phone) return [phone, null, []];
+}
+for (const elem of document.querySelectorAll('[data-phone], [data-tel], [data-telephone]')) {
+    const phone = elem.getAttribute('data-phone') || elem.getAttribute('data-tel') || elem.getAttribute('data-telephone');
+    if (phone) return [phone, null, []];
+}
+const texts = Array.from(
+    document.querySelectorAll(".phone, .tel, .telephone, [class*='phone'], [class*='tel']"),
+    elem => elem.innerText || '');
+return [null, document.documentElement.outerHTML, texts];
+'''
+# Картинки, стили, шрифты и видео для поиска телефона не нужны — Chrome их не загружает
+BLOCKED_URLS = ['*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.css', '*.woff', '*.woff2', '*.ttf', '*.mp4']
+PAGE_FETCH_WORKERS = 4             # потоков загрузки страниц каталога
+PAGE_FETCH_CONCURRENCY = 2         # одновременных запросов к одному сайту
+PAGE_PARSE_WORKERS = min(PAGE_FETCH_WORKERS, os.cpu_count() or 1)  # процессов разбора страниц каталога
+ENRICH_WORKERS = 4                 # потоков обогащения из детальных страниц
+HTTP_POOL_HOSTS = 50               # хостов с keep-alive пулом (каталоги + сайты поселков при обогащении)
+HTTP_POOL_SIZE = 10                # соединений в пуле одного хоста
+HTTP_RETRIES = 3                   # повторов запроса при сетевых ошибках и 429/5xx
+
+# Все страницы разбираются C-парсером lxml (если установлен); у каталога Cian.ru
+# при этом только контейнеры карточек, ссылки и заголовки — остальная разметка
+# в дерево не попадает
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+CIAN_CATALOG_STRAINER = SoupStrainer(['a', 'article', 'div', 'h1', 'h2', 'h3', 'h4'])
+
+# Регулярные выражения компилируются один раз при загрузке модуля, а не на каждой карточке
+_PHONE_PATTERNS = (
+    r'\+?7\s?\(?\d{3}\)?\s?\d{3}[- ]?\d{2}[- ]?\d{2}',
+    r'\+?7\s?\d{10}',
+    r'8\s?\(?\d{3}\)?\s?\d{3}[- ]?\d{2}[- ]?\d{2}',
+    r'\d{3}[- ]?\d{3}[- ]?\d{2}[- ]?\d{2}',
+)
+_PHONE_RES = tuple(re.compile(p) for p in _PHONE_PATTERNS)
+# Все форматы телефона одним проходом (альтернативы в порядке приоритета)
+_PHONE_COMBINED_RE = re.compile('|'.join(_PHONE_PATTERNS))
+_PHONE_JUNK_RE = re.compile(r'[\s\-\(\)]')
+_NON_PHONE_CHARS_RE = re.compile(r'[^\d+]')
+_EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+_DIGITS_RE = re.compile(r'\d+')
+_WHITESPACE_RE = re.compile(r'\s+')
+_NON_WORD_RE = re.compile(r'[^\w\s]')
+# Поля, по которым сравнивается полнота дубликатов (при сохранении — и ссылка)
+_DEDUP_SCORE_FIELDS = ('Адрес', 'Телефон основной', 'Email', 'Количество домов/участков')
+_SAVE_SCORE_FIELDS = _DEDUP_SCORE_FIELDS + ('Ссылка на источник',)
+# Невалидные названия: простые слова проверяются подстрокой ('ещё фото' и 'первичная
+# продажа' покрываются словами 'фото' и 'продажа'), выражения — одним проходом
+_INVALID_NAME_WORDS = ('продажа', 'фото', 'подробнее', 'смотреть', 'клик', 'нажмите', 'подробности')
+_INVALID_NAME_RE = re.compile(
+    r'читать\s*далее|^\d+$|^[а-яё]{1,2}$|коттеджные\s*посёлки\s*в\s*|коттеджные\s*поселки\s*в\s*'
+    r'|поселки\s*в\s*области|коттеджные\s*поселки$',
+    re.I,
+)
+# Слишком общие названия (должно быть конкретное название)
+_GENERIC_NAMES = frozenset({'коттеджные посёлки', 'коттеджные поселки', 'поселки', 'кп'})
+# Ссылки на квартиры, комнаты, коммерческую недвижимость и гаражи
+_NON_VILLAGE_URL_RE = re.compile(r'/sale/(?:flat|room|commercial|garage)/', re.I)
+
+# Cian.ru: поиск карточек и их полей
+_CIAN_CARD_ATTR_RE = re.compile(r'Card|Offer', re.I)
+_CIAN_CARD_CLASS_RE = re.compile(r'card|item|village|offer|lot', re.I)
+_CIAN_VILLAGE_HREF_RE = re.compile(r'kottedzhnye-poselki|poselok|uchastok', re.I)
+_CIAN_CATALOG_HREF_RE = re.compile(r'kottedzhnye-poselki', re.I)
+_CIAN_TITLE_ATTR_RE = re.compile(r'Title|Name', re.I)
+_CIAN_TITLE_CLASS_RE = re.compile(r'title|name|heading', re.I)
+_CIAN_TITLE_TEXT_RE = re.compile(r'[А-ЯЁ][а-яё]+.*поселок|поселок.*[А-ЯЁ]', re.I)
+_CIAN_ADDRESS_ATTR_RE = re.compile(r'Address|Location|Geo', re.I)
+_CIAN_ADDRESS_CLASS_RE = re.compile(r'address|location|geo|region', re.I)
+_CIAN_ADDRESS_TEXT_RES = tuple(re.compile(p, re.I) for p in (
+    r'[А-ЯЁ][а-яё]+\s*(?:область|край|район)',
+    r'[А-ЯЁ][а-яё]+\s*шоссе',
+    r'\d+\s*км\s*до\s*МКАД',
+))
+_ADDRESS_SPLIT_RE = re.compile(r'[,;]')
+# Количество домов/участков: "120 домов", "50 участков", "коттеджей: 80"
+_HOUSES_RES = tuple(re.compile(p, re.I) for p in (
+    r'(\d+)\s*(?:дом|участк|коттедж|лот)',
+    r'(?:дом|участк|коттедж|лот)[а-яё]*[:\s]+(\d+)',
+    r'(\d+)\s*в\s*продаже',
+))
+# Статус, ограждение, КПП и охрана — за один проход по тексту карточки: опережающая
+# проверка ничего не поглощает, поэтому находятся все вхождения, как у отдельных
+# поисков (разные группы не могут совпасть с одной позиции — различаются первые буквы).
+# 'чоп' — отдельная группа: он означает и охрану, и тип охраны
+_CARD_FLAGS_RE = re.compile(
+    r'(?=(?P<built>построен|заселен)|(?P<building>сдача|строительств)|(?P<fence>огражден|забор|периметр)'
+    r'|(?P<kpp>кпп|контрольно-пропускной|пропускной\s*пункт)|(?P<chop>чоп)|(?P<security>охрана|охраняем))',
+    re.I,
+)
+_KPP_COUNT_RE = re.compile(r'(\d+)\s*кпп', re.I)
+_TEL_HREF_RE = re.compile(r'tel:', re.I)
+_PHONE_CLASS_RE = re.compile(r'phone|tel|show.*phone', re.I)
+_MAILTO_HREF_RE = re.compile(r'mailto:', re.I)
+
+# Детальная страница поселка (enrich_village_data)
+_PAGE_HOUSES_RES = tuple(re.compile(p, re.I) for p in (
+    r'(\d+)\s*(?:дом|участк|коттедж|лот)\s*в\s*продаже',
+    r'в\s*продаже\s*(\d+)\s*(?:дом|участк|коттедж|лот)',
+    r'(\d+)\s*(?:дом|участк|коттедж|лот)',
+    r'количество[:\s]+(\d+)',
+))
+# Ограждение, КПП, охрана, статус и интернет — за один проход по тексту страницы,
+# как _CARD_FLAGS_RE. 'чоп' — отдельная группа: он означает и охрану, и тип охраны.
+# 'ограждение' и 'подключен.*интернет' не нужны — их покрывают 'огражден' и 'интернет'
+_PAGE_FLAGS_RE = re.compile(
+    r'(?=(?P<fence>огражден|забор|периметр|защищен)'
+    r'|(?P<kpp>кпп|контрольно-пропускной|пропускной\s*пункт|контроль\s*доступа)'
+    r'|(?P<chop>чоп)|(?P<security>охрана|охраняем|безопасность|сторож)|(?P<private>частн.*охранн)'
+    r'|(?P<own_security>собственн.*охрана|внутренн.*охрана)'
+    r'|(?P<built>построен|заселен|сдан|эксплуат)|(?P<building>сдача\s*в\s*\d{4}|строительств|возводится)'
+    r'|(?P<internet>интернет|wi-fi|wifi))',
+    re.I,
+)
+# Какие вопросы о странице окончательно решает найденная группа. Менее приоритетные
+# группы (own_security после ЧОП, building после построен) ничего не решают: пока
+# не встретилась приоритетная, ответ может измениться
+_PAGE_FLAG_DECIDES = {
+    'fence': ('fence',),
+    'kpp': ('kpp',),
+    'chop': ('security', 'security_type'),
+    'security': ('security',),
+    'private': ('security_type',),
+    'own_security': (),
+    'built': ('status',),
+    'building': (),
+    'internet': ('internet',),
+}
+_PAGE_KPP_COUNT_RES = (_KPP_COUNT_RE, re.compile(r'кпп[:\s]+(\d+)', re.I))
+_PAGE_PHONE_CLASS_RE = re.compile(r'phone|contact|tel', re.I)
+_PAGE_EMAIL_CLASS_RE = re.compile(r'email|mail|contact', re.I)
+_EXTERNAL_HREF_RE = re.compile(r'^https?://', re.I)
+# Соцсети и агрегаторы — не сайт поселка/УК
+_EXCLUDED_SITE_DOMAINS = ('cian.ru', 'domclick.ru', 'yandex.ru', 'google.com',
+                          'vk.com', 'facebook.com', 'instagram.com', 'ok.ru')
+_UK_NAME_RES = tuple(re.compile(p, re.I) for p in (
+    r'управляющ.*компани[яи]?[:\s]+([А-ЯЁ][А-Яа-яё\s«»""]+)',
+    r'ук[:\s]+([А-ЯЁ][А-Яа-яё\s«»""]+)',
+    r'тсж[:\s]+([А-ЯЁ][А-Яа-яё\s«»""]+)',
+))
+
+
+def _attr_matches(value, pattern) -> bool:
+    """
+    Совпадение значения атрибута с выражением так же, как в find_all(attr=re.compile(...)):
+    у многозначных атрибутов (class) — по каждому значению, затем по строке через пробел
+    """
+    if value is None:
+        return False
+    if isinstance(value, str):
+        return pattern.search(value) is not None
+    return any(pattern.search(v) for v in value) or pattern.search(' '.join(value)) is not None
+
+
+def _scan_cian_catalog(soup):
+    """
+    Кандидаты в карточки Cian.ru за один обход дерева страницы:
+    элементы с data-name Card/Offer, article/div с «карточным» классом и ссылки
+    на поселки — каждый список в порядке документа, как у отдельных find_all
+    """
+    by_attr, by_class, links = [], [], []
+    for tag in soup.find_all(True):
+        if _attr_matches(tag.get('data-name'), _CIAN_CARD_ATTR_RE):
+            by_attr.append(tag)
+        if tag.name in ('article', 'div') and _attr_matches(tag.get('class'), _CIAN_CARD_CLASS_RE):
+            by_class.append(tag)
+        elif tag.name == 'a' and _attr_matches(tag.get('href'), _CIAN_VILLAGE_HREF_RE):
+            links.append(tag)
+    return by_attr, by_class, links
+
+
+def _scan_cian_card(card) -> Dict:
+    """
+    Элементы карточки Cian.ru за один обход её поддерева: все ссылки и первые
+    (в порядке документа) кандидаты на название, адрес, телефон и email —
+    то же, что вернули бы отдельные card.find / card.find_all
+    """
+    found = {'links': []}
+    for tag in card.find_all(True):
+        name = tag.name
+        href = tag.get('href')
+        if name == 'a' and href is not None:
+            found['links'].append(tag)
+            if 'mailto' not in found and _attr_matches(href, _MAILTO_HREF_RE):
+                found['mailto'] = tag
+        if 'title_attr' not in found and _attr_matches(tag.get('data-name'), _CIAN_TITLE_ATTR_RE):
+            found['title_attr'] = tag
+        if 'address_attr' not in found and _attr_matches(tag.get('data-name'), _CIAN_ADDRESS_ATTR_RE):
+            found['address_attr'] = tag
+        classes = tag.get('class')
+        if name in ('h1', 'h2', 'h3', 'h4'):
+            if 'title_heading' not in found and _attr_matches(classes, _CIAN_TITLE_CLASS_RE):
+                found['title_heading'] = tag
+        elif name in ('a', 'span', 'button'):
+            if 'tel' not in found and _attr_matches(href, _TEL_HREF_RE):
+                found['tel'] = tag
+            if 'phone_class' not in found and _attr_matches(classes, _PHONE_CLASS_RE):
+                found['phone_class'] = tag
+        if name in ('div', 'span'):
+            if 'address_class' not in found and _attr_matches(classes, _CIAN_ADDRESS_CLASS_RE):
+                found['address_class'] = tag
+    return found
+
+
+def _first_string_match(card, patterns):
+    """
+    Строка карточки, найденная первым по приоритету выражением из patterns, —
+    как card.find_all(string=pattern)[0] для каждого выражения по очереди, но за
+    один обход строк (и без обхода до конца, если совпало первое выражение)
+    """
+    first = [None] * len(patterns)
+    for string in card.find_all(string=True):
+        for k, pattern in enumerate(patterns):
+            if first[k] is None and pattern.search(string):
+                first[k] = string
+        if first[0] is not None:
+            break
+    return next((string for string in first if string is not None), None)
+
+
+def _search_phone(text: str) -> Optional[str]:
+    """
+    Первый найденный телефон с учётом приоритета форматов: как поиск каждым
+    выражением из _PHONE_RES по очереди, но обычно за один проход по тексту.
+    """
+    m = _PHONE_COMBINED_RE.search(text)
+    if not m:
+        return None
+    # Самое левое совпадение — первого (приоритетного) формата: его и вернул бы
+    # поиск по очереди. Иначе форматы проверяются по одному, как раньше, но
+    # только с этой позиции: левее совпадений нет ни у одного формата
+    start = m.start()
+    if _PHONE_RES[0].match(text, start):
+        return m.group(0)
+    for pat in _PHONE_RES:
+        m = pat.search(text, start)
+        if m:
+            return m.group(0)
+    return None
+
+
+def _is_service_email(email: str) -> bool:
+    """Служебный email агрегатора (cian.ru, support), а не поселка"""
+    email_lower = email.lower()
+    return 'cian.ru' in email_lower or 'support' in email_lower
+
+
+def _dedup_key(village: Dict) -> Tuple[str, ...]:
+    """
+    Ключ для удаления дубликатов: название без знаков препинания и лишних
+    пробелов и адрес (только название, если адреса нет)
+    """
+    name = village.get('Название поселка', '').lower().strip()
+    name_normalized = _WHITESPACE_RE.sub(' ', _NON_WORD_RE.sub('', name)).strip()
+    address = village.get('Адрес', '').lower().strip() if village.get('Адрес') else ''
+    return (name_normalized, address) if address else (name_normalized,)
+
+
+def _completeness(village: Dict, fields: Tuple[str, ...]) -> int:
+    """Сколько из полей fields заполнено — из двух дубликатов остаётся более полный"""
+    return sum(1 for f in fields if village.get(f))
+
+# Буфер записи CSV (байт)
+CSV_BUFFER_SIZE = 1024 * 1024
+
+# PID запущенного парсера (читает monitor_parsing.py)
+PID_FILE = '/tmp/parse_cottage_villages.pid'
 
 # Структура полей таблицы согласно инструкции
 FIELDS = [
@@ -89,23 +409,94 @@ FIELDS = [
 ]
 
 
+# Пустая запись поселка Cian.ru (поля в порядке FIELDS): карточка копирует её
+# и заполняет ID и даты, вместо сборки словаря из ~40 литералов на каждую карточку
+_EMPTY_CIAN_VILLAGE = {
+    'ID': None,
+    'Название поселка': None,
+    'Регион': None,
+    'Город/Район': None,
+    'Адрес': None,
+    'Координаты': None,
+    'Ссылка на источник': None,
+    'Количество домов/участков': None,
+    'Статус поселка': None,
+    'Наличие ограждения': None,
+    'Наличие КПП': None,
+    'Количество КПП': None,
+    'Наличие охраны': None,
+    'Тип охраны': None,
+    'Наличие интернета': None,
+    'Тип управления': None,
+    'Название УК/ТСЖ': None,
+    'ФИО председателя/руководителя': None,
+    'Телефон основной': None,
+    'Телефон дополнительный': None,
+    'Email': None,
+    'Сайт поселка/УК': None,
+    'Социальные сети': None,
+    'Challenges (Проблемы)': None,
+    'Authority (Полномочия)': 'Неизвестно',
+    'Money (Бюджет)': 'Неизвестно',
+    'Priority (Приоритет)': 'Неизвестно',
+    'Оценка целевого клиента': 'Требует проверки',
+    'Статус в CRM': 'Не обработан',
+    'ID сделки в CRM': None,
+    'Менеджер': None,
+    'Дата первого контакта': None,
+    'Дата последнего контакта': None,
+    'Следующий контакт': None,
+    'Комментарии': None,
+    'Результат': 'Не обработан',
+    'Дата продажи': None,
+    'Сумма сделки': None,
+    'Причина отказа': None,
+    'Источник информации': 'Cian.ru',
+    'Дата добавления в базу': None,
+    'Дата последнего обновления': None,
+    'Кто добавил': 'Парсер'
+}
+assert list(_EMPTY_CIAN_VILLAGE) == FIELDS
+
+
+def _row_values(village: Dict) -> List:
+    """
+    Строка CSV в порядке FIELDS: отсутствующие поля пустые, лишние ключи
+    не попадают — как в DictWriter(extrasaction='ignore'), но без его
+    проверок и перестройки строки через словарь
+    """
+    get = village.get
+    return [get(field, '') for field in FIELDS]
+
+
 class SeleniumPhoneExtractor:
     """Класс для извлечения телефонов с использованием Selenium"""
     
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, cache_file: Optional[str] = None, phone_cache: Optional[Dict] = None):
         """
         Инициализация Selenium WebDriver
         
         Args:
             headless: Запуск браузера в фоновом режиме (без GUI)
+            cache_file: Файл кэша телефонов по URL (None — без кэша)
+            phone_cache: Кэш телефонов другого экземпляра (для браузеров пула;
+                сохраняет его в файл владелец)
         """
         self.driver = None
         self.headless = headless
+        self.cache_file = cache_file
+        self._phone_cache = self._load_phone_cache() if cache_file else phone_cache
+        self._has_page = False  # открывалась ли уже страница (есть ли что очищать)
         self._init_driver()
     
     def _init_driver(self):
         """Инициализация Chrome WebDriver"""
         try:
+            from selenium import webdriver
+            from selenium.webdriver.chrome.options import Options
+            from selenium.webdriver.chrome.service import Service
+            from webdriver_manager.chrome import ChromeDriverManager
+            
             chrome_options = Options()
             if self.headless:
                 chrome_options.add_argument('--headless')
@@ -115,10 +506,18 @@ class SeleniumPhoneExtractor:
             chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
+            # Картинки не загружаются и без CDP (если блокировка по URL недоступна)
+            chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
             
             service = Service(ChromeDriverManager().install())
             self.driver = webdriver.Chrome(service=service, options=chrome_options)
             self.driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+            try:
+                self.driver.execute_cdp_cmd('Network.enable', {})
+                self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': BLOCKED_URLS})
+            except Exception as e:
+                logger.debug(f"Не удалось отключить загрузку картинок и стилей: {e}")
+            self._has_page = False
             logger.info("Selenium WebDriver инициализирован успешно")
         except ImportError as e:
             logger.error(f"Selenium не установлен. Установите: pip install selenium webdriver-manager. Ошибка: {e}")
@@ -132,6 +531,9 @@ class SeleniumPhoneExtractor:
         """
         Извлечение телефона со страницы с использованием Selenium
         
+        Страницы, проверенные за последние PHONE_CACHE_TTL секунд, браузером
+        повторно не открываются — результат берётся из кэша.
+        
         Args:
             url: URL страницы для парсинга
             wait_time: Время ожидания загрузки страницы (секунды)
@@ -142,100 +544,86 @@ class SeleniumPhoneExtractor:
         if not self.driver or not url:
             return None
         
+        if self._phone_cache is not None:
+            cached = self._phone_cache.get(url)
+            if cached and time.time() - cached[1] < PHONE_CACHE_TTL:
+                logger.debug(f"Телефон для {url} взят из кэша")
+                return cached[0] or None
+        
+        phone = self._load_phone(url, wait_time)
+        # Ошибки загрузки (None) не кэшируются — страница будет проверена снова
+        if phone is not None and self._phone_cache is not None:
+            self._phone_cache[url] = [phone, int(time.time())]
+        return phone or None
+    
+    def _load_phone(self, url: str, wait_time: int = 5, retry: bool = True) -> Optional[str]:
+        """
+        Открывает страницу в браузере и ищет на ней телефон
+        
+        Один браузер используется для всех страниц; заново он запускается
+        только если сессия потеряна (и тогда страница открывается повторно).
+        
+        Returns:
+            Номер телефона, '' — если страница загружена, но телефона нет,
+            None — при ошибке загрузки
+        """
+        if not self.driver:
+            return None
+        
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+        
         try:
+            # Куки предыдущей страницы не переносим на следующую
+            if self._has_page:
+                self.driver.delete_all_cookies()
             logger.debug(f"Открываем страницу с Selenium: {url}")
             self.driver.get(url)
+            self._has_page = True
             
-            # Ждем загрузки страницы
-            time.sleep(random.uniform(2, 4))  # Случайная задержка для имитации человеческого поведения
-            
-            # Паттерны для поиска кнопок "Показать телефон"
-            show_phone_button_selectors = [
-                # Cian.ru
-                "//button[contains(@class, 'phone') or contains(@class, 'show-phone') or contains(text(), 'Показать телефон')]",
-                "//a[contains(@class, 'phone') or contains(@class, 'show-phone')]",
-                "//*[@data-name='PhoneButton']",
-                "//*[contains(@data-testid, 'phone')]",
-                # Общие паттерны
-                "//button[contains(translate(text(), 'АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ', 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'), 'показать телефон')]",
-                "//a[contains(translate(text(), 'АБВГДЕЁЖЗИЙКЛМНОПРСТУФХЦЧШЩЪЫЬЭЮЯ', 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя'), 'показать телефон')]",
-                "//*[contains(@class, 'show-phone')]",
-                "//*[contains(@class, 'phone-button')]",
-                "//*[contains(@class, 'contact-phone')]",
-            ]
+            # Ждем загрузки страницы (до готовности, а не фиксированное время)
+            WebDriverWait(self.driver, wait_time).until(EC.presence_of_element_located((By.TAG_NAME, 'body')))
+            # Небольшая случайная задержка для имитации человеческого поведения
+            time.sleep(random.uniform(0.2, 0.4))
             
-            # Пытаемся найти и кликнуть на кнопку "Показать телефон"
-            phone_button = None
-            for selector in show_phone_button_selectors:
-                try:
-                    if selector.startswith('//'):
-                        # XPath селектор
-                        elements = self.driver.find_elements(By.XPATH, selector)
-                    else:
-                        # CSS селектор
-                        elements = self.driver.find_elements(By.CSS_SELECTOR, selector)
-                    
-                    for element in elements:
-                        if element.is_displayed() and element.is_enabled():
-                            phone_button = element
-                            break
-                    
-                    if phone_button:
-                        break
-                except Exception as e:
-                    logger.debug(f"Не удалось найти элемент по селектору {selector}: {e}")
-                    continue
+            # Пытаемся найти и кликнуть на кнопку "Показать телефон": все селекторы
+            # проверяются в браузере одним вызовом, а не find_elements и
+            # is_displayed/is_enabled на каждый элемент
+            phone_button = self.driver.execute_script(SHOW_PHONE_BUTTON_JS, SHOW_PHONE_BUTTON_XPATHS)
             
             # Кликаем на кнопку, если нашли
             if phone_button:
                 try:
                     # Прокручиваем к элементу
                     self.driver.execute_script("arguments[0].scrollIntoView(true);", phone_button)
-                    time.sleep(0.5)
                     
                     # Пытаемся кликнуть
                     phone_button.click()
-                    time.sleep(1)  # Ждем загрузки телефона
+                    self._wait_phone_revealed(phone_button)  # Ждем загрузки телефона
                     logger.debug("Клик на кнопку 'Показать телефон' выполнен")
                 except Exception as e:
                     logger.debug(f"Не удалось кликнуть на кнопку: {e}")
                     # Пробуем через JavaScript
                     try:
                         self.driver.execute_script("arguments[0].click();", phone_button)
-                        time.sleep(1)
+                        self._wait_phone_revealed(phone_button)
                     except:
                         pass
             
             # Ищем телефон в различных местах на странице
-            phone = None
-            
-            # Стратегия 1: Поиск в tel: ссылках
-            tel_links = self.driver.find_elements(By.XPATH, "//a[starts-with(@href, 'tel:')]")
-            for link in tel_links:
-                href = link.get_attribute('href')
-                if href:
-                    phone = href.replace('tel:', '').strip()
-                    if phone:
-                        break
-            
-            # Стратегия 2: Поиск в data-атрибутах
-            if not phone:
-                phone_elements = self.driver.find_elements(By.XPATH, "//*[@data-phone or @data-tel or @data-telephone]")
-                for elem in phone_elements:
-                    phone = elem.get_attribute('data-phone') or elem.get_attribute('data-tel') or elem.get_attribute('data-telephone')
-                    if phone:
-                        break
+            # Стратегии 1-2 (tel: ссылки и data-атрибуты) выполняются в браузере,
+            # он же возвращает данные для стратегий 3-4 — один запрос к chromedriver
+            phone, page_source, phone_texts = self.driver.execute_script(PHONE_LOOKUP_JS)
             
             # Стратегия 3: Поиск в тексте страницы после клика
             if not phone:
-                page_source = self.driver.page_source
                 phone = self._extract_phone_from_text(page_source)
             
             # Стратегия 4: Поиск в видимом тексте элементов с классом phone
             if not phone:
-                phone_elements = self.driver.find_elements(By.CSS_SELECTOR, ".phone, .tel, .telephone, [class*='phone'], [class*='tel']")
-                for elem in phone_elements:
-                    text = elem.text.strip()
+                for text in phone_texts:
+                    text = text.strip()
                     if text:
                         phone = self._extract_phone_from_text(text)
                         if phone:
@@ -248,36 +636,57 @@ class SeleniumPhoneExtractor:
                 return phone
             
             logger.debug("Телефон не найден на странице")
-            return None
+            return ''
             
         except TimeoutException:
             logger.warning(f"Таймаут при загрузке страницы: {url}")
             return None
         except WebDriverException as e:
+            if retry and self._session_lost(e):
+                logger.warning(f"Сессия WebDriver потеряна, перезапускаем браузер: {e}")
+                self._quit_driver()
+                self._init_driver()
+                return self._load_phone(url, wait_time, retry=False)
             logger.warning(f"Ошибка WebDriver при парсинге {url}: {e}")
             return None
         except Exception as e:
             logger.warning(f"Ошибка при извлечении телефона с {url}: {e}")
             return None
     
+    def _wait_phone_revealed(self, phone_button):
+        """
+        Ожидание телефона после клика (не дольше PHONE_WAIT_TIMEOUT): появилась
+        tel:-ссылка или data-атрибут, в кнопке показались цифры или кнопка исчезла
+        """
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        
+        def revealed(driver):
+            if driver.find_elements(By.XPATH, PHONE_NODES_XPATH):
+                return True
+            try:
+                return not phone_button.is_displayed() or any(ch.isdigit() for ch in phone_button.text)
+            except StaleElementReferenceException:
+                return True
+        
+        try:
+            WebDriverWait(self.driver, PHONE_WAIT_TIMEOUT).until(revealed)
+        except TimeoutException:
+            pass
+    
+    @staticmethod
+    def _session_lost(error: WebDriverException) -> bool:
+        """Потеряна ли сессия браузера (упал Chrome или chromedriver)"""
+        message = str(error).lower()
+        return any(marker in message for marker in SESSION_LOST_MARKERS)
+    
     def _extract_phone_from_text(self, text: str) -> Optional[str]:
         """Извлечение телефона из текста с помощью регулярных выражений"""
         if not text:
             return None
         
-        patterns = [
-            r'\+?7\s?\(?\d{3}\)?\s?\d{3}[- ]?\d{2}[- ]?\d{2}',
-            r'\+?7\s?\d{10}',
-            r'8\s?\(?\d{3}\)?\s?\d{3}[- ]?\d{2}[- ]?\d{2}',
-            r'\d{3}[- ]?\d{3}[- ]?\d{2}[- ]?\d{2}',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                return match.group(0).strip()
-        
-        return None
+        phone = _search_phone(text)
+        return phone.strip() if phone else None
     
     def _normalize_phone(self, phone: str) -> str:
         """Нормализация формата телефона"""
@@ -285,7 +694,7 @@ class SeleniumPhoneExtractor:
             return phone
         
         # Удаляем все символы кроме цифр и +
-        phone = re.sub(r'[^\d+]', '', phone)
+        phone = _NON_PHONE_CHARS_RE.sub('', phone)
         
         # Заменяем 8 на +7
         if phone.startswith('8'):
@@ -298,7 +707,36 @@ class SeleniumPhoneExtractor:
         
         return phone
     
+    def _load_phone_cache(self) -> Dict[str, List]:
+        """Загружает кэш телефонов без устаревших записей (пустой, если кэша нет или он повреждён)"""
+        try:
+            with open(self.cache_file, encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict):
+            return {}
+        now = time.time()
+        return {url: entry for url, entry in cache.items()
+                if isinstance(entry, list) and len(entry) == 2 and now - entry[1] < PHONE_CACHE_TTL}
+    
+    def _save_phone_cache(self):
+        """Сохраняет кэш телефонов (ошибка записи не прерывает работу)"""
+        tmp_path = self.cache_file + '.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._phone_cache, f, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            logger.warning(f"Не удалось сохранить кэш телефонов {self.cache_file}: {e}")
+    
     def close(self):
+        """Закрытие WebDriver и сохранение кэша телефонов"""
+        if self.cache_file and self._phone_cache is not None:
+            self._save_phone_cache()
+        self._quit_driver()
+    
+    def _quit_driver(self):
         """Закрытие WebDriver"""
         if self.driver:
             try:
@@ -306,36 +744,92 @@ class SeleniumPhoneExtractor:
                 logger.info("Selenium WebDriver закрыт")
             except Exception as e:
                 logger.warning(f"Ошибка при закрытии WebDriver: {e}")
+            # Повторный вызов ничего не делает
+            self.driver = None
+
+
+class SeleniumPhonePool:
+    """
+    Несколько браузеров для параллельного получения телефонов: каждый поток
+    берёт свободный браузер из очереди и возвращает его после страницы
+    """
+    
+    def __init__(self, primary: SeleniumPhoneExtractor, size: int = SELENIUM_POOL_SIZE):
+        """
+        Args:
+            primary: Основной экстрактор (его браузер и кэш телефонов используются пулом)
+            size: Число браузеров в пуле вместе с основным
+        """
+        self.extractors = [primary]
+        for _ in range(size - 1):
+            extractor = SeleniumPhoneExtractor(headless=primary.headless, phone_cache=primary._phone_cache)
+            if not extractor.driver:
+                # Chrome не запустился (не хватает памяти и т.п.) — работаем с тем, что есть
+                break
+            self.extractors.append(extractor)
+        self._idle = queue.Queue()
+        for extractor in self.extractors:
+            self._idle.put(extractor)
+        logger.info(f"Пул Selenium: {len(self.extractors)} браузеров")
+    
+    @property
+    def size(self) -> int:
+        return len(self.extractors)
+    
+    def extract_phone_from_url(self, url: str) -> Optional[str]:
+        """Телефон со страницы через первый свободный браузер пула"""
+        extractor = self._idle.get()
+        try:
+            return extractor.extract_phone_from_url(url)
+        finally:
+            self._idle.put(extractor)
     
-    def __del__(self):
-        """Деструктор для автоматического закрытия WebDriver"""
-        self.close()
+    def close(self):
+        """Закрытие дополнительных браузеров (основной закрывает его владелец)"""
+        for extractor in self.extractors[1:]:
+            extractor.close()
+        self.extractors = self.extractors[:1]
 
 
 class VillageParser:
     """Класс для парсинга информации о коттеджных поселках"""
     
-    def __init__(self, use_selenium: bool = True, selenium_headless: bool = True):
+    def __init__(self, use_selenium: bool = True, selenium_headless: bool = True, use_cache: bool = True):
         """
         Инициализация парсера
         
         Args:
             use_selenium: Использовать Selenium для получения телефонов
             selenium_headless: Запуск Selenium в headless режиме
+            use_cache: Брать телефоны уже проверенных страниц из PHONE_CACHE_FILE
         """
         self.session = requests.Session()
         self.session.headers.update(HEADERS)
+        # Пул keep-alive соединений на все источники и повторы с паузой (с учётом
+        # Retry-After) при 429/5xx; после исчерпания повторов возвращается
+        # последний ответ, его код проверяют сами парсеры
+        adapter = HTTPAdapter(
+            pool_connections=HTTP_POOL_HOSTS,
+            pool_maxsize=HTTP_POOL_SIZE,
+            max_retries=Retry(total=HTTP_RETRIES, backoff_factor=0.5,
+                              status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False),
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         self.results: List[Dict] = []
         self.village_id = 1
         self.current_date = datetime.now().strftime('%Y-%m-%d')
         self.use_selenium = use_selenium
         self.selenium_extractor = None
+        self.selenium_pool = None            # Пул браузеров (создаётся при первой пачке телефонов)
         self.selenium_phones_count = 0       # Счетчик телефонов, полученных через Selenium
         self.selenium_phone_attempts = 0     # Счетчик попыток (лимит для защиты от зависаний)
+        self._page_semaphore = threading.Semaphore(PAGE_FETCH_CONCURRENCY)
         
         if self.use_selenium:
             try:
-                self.selenium_extractor = SeleniumPhoneExtractor(headless=selenium_headless)
+                self.selenium_extractor = SeleniumPhoneExtractor(
+                    headless=selenium_headless, cache_file=PHONE_CACHE_FILE if use_cache else None)
             except Exception as e:
                 logger.warning(f"Не удалось инициализировать Selenium: {e}. Парсинг будет работать без Selenium.")
                 self.use_selenium = False
@@ -344,6 +838,59 @@ class VillageParser:
         """Случайная задержка между запросами"""
         time.sleep(random.uniform(DELAY_MIN, DELAY_MAX))
     
+    def _fetch_page(self, url: str) -> bytes:
+        """Загрузка страницы каталога (выполняется в потоке загрузки)"""
+        self.delay()
+        # Не больше PAGE_FETCH_CONCURRENCY одновременных запросов к сайту
+        with self._page_semaphore:
+            response = self.session.get(url, timeout=30)
+        response.raise_for_status()
+        # Сырые байты: кодировку определяет сам парсер, без отдельного декодирования в str
+        return response.content
+    
+    def close_selenium(self):
+        """Закрытие всех браузеров Selenium и сохранение кэша телефонов"""
+        if self.selenium_pool:
+            self.selenium_pool.close()
+            self.selenium_pool = None
+        if self.selenium_extractor:
+            self.selenium_extractor.close()
+    
+    def _selenium_pool_phone(self, village: Dict) -> Optional[str]:
+        """Телефон поселка через пул браузеров (выполняется в потоке пула)"""
+        try:
+            logger.debug(f"Попытка получить телефон через Selenium для {village.get('Название поселка')}")
+            self.delay()
+            return self.selenium_pool.extract_phone_from_url(village['Ссылка на источник'])
+        except Exception as e:
+            logger.debug(f"Ошибка при получении телефона через Selenium: {e}")
+            return None
+    
+    def _fill_phones_with_selenium(self, villages: List[Dict]):
+        """
+        Телефоны для поселков без телефона, но со ссылкой на страницу — через
+        пул браузеров, несколько страниц одновременно
+        """
+        if not self.use_selenium or not self.selenium_extractor:
+            return
+        pending = []
+        for village in villages:
+            if not village.get('Телефон основной') and village.get('Ссылка на источник'):
+                if not self._can_do_selenium_phone():
+                    break
+                pending.append(village)
+        if not pending:
+            return
+        if self.selenium_pool is None:
+            self.selenium_pool = SeleniumPhonePool(self.selenium_extractor)
+        with ThreadPoolExecutor(max_workers=self.selenium_pool.size) as executor:
+            phones = list(executor.map(self._selenium_pool_phone, pending))
+        for village, phone in zip(pending, phones):
+            if phone:
+                village['Телефон основной'] = phone
+                self.selenium_phones_count += 1
+                logger.info(f"Телефон получен через Selenium: {phone}")
+    
     def _can_do_selenium_phone(self) -> bool:
         """Проверка лимита попыток получения телефона через Selenium (защита от зависаний)."""
         if self.selenium_phone_attempts >= MAX_SELENIUM_PHONE_ATTEMPTS:
@@ -357,25 +904,15 @@ class VillageParser:
         if not text:
             return None
         
-        # Паттерны для поиска телефонов
-        patterns = [
-            r'\+?7\s?\(?\d{3}\)?\s?\d{3}[- ]?\d{2}[- ]?\d{2}',
-            r'\+?7\s?\d{10}',
-            r'8\s?\(?\d{3}\)?\s?\d{3}[- ]?\d{2}[- ]?\d{2}',
-            r'\d{3}[- ]?\d{3}[- ]?\d{2}[- ]?\d{2}',
-        ]
-        
-        for pattern in patterns:
-            match = re.search(pattern, text)
-            if match:
-                phone = match.group(0).strip()
-                # Нормализация телефона
-                phone = re.sub(r'[\s\-\(\)]', '', phone)
-                if phone.startswith('8'):
-                    phone = '+7' + phone[1:]
-                elif not phone.startswith('+7'):
-                    phone = '+7' + phone
-                return phone
+        phone = _search_phone(text)
+        if phone:
+            # Нормализация телефона
+            phone = _PHONE_JUNK_RE.sub('', phone.strip())
+            if phone.startswith('8'):
+                phone = '+7' + phone[1:]
+            elif not phone.startswith('+7'):
+                phone = '+7' + phone
+            return phone
         return None
     
     def extract_email(self, text: str) -> Optional[str]:
@@ -383,8 +920,7 @@ class VillageParser:
         if not text:
             return None
         
-        pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        match = re.search(pattern, text)
+        match = _EMAIL_RE.search(text)
         return match.group(0) if match else None
     
     def extract_number(self, text: str) -> Optional[int]:
@@ -393,51 +929,33 @@ class VillageParser:
             return None
         
         # Удаляем пробелы и ищем числа
-        numbers = re.findall(r'\d+', text.replace(' ', ''))
-        if numbers:
+        number = _DIGITS_RE.search(text.replace(' ', ''))
+        if number:
             try:
-                return int(numbers[0])
+                return int(number.group(0))
             except ValueError:
                 return None
         return None
     
     def validate_village_name(self, name: str) -> bool:
         """Валидация названия поселка"""
-        if not name or len(name.strip()) < 3:
+        # Сначала дешёвые проверки: короткие и слишком общие названия
+        # отсекаются без поиска по словам и регулярному выражению
+        if not name:
+            return False
+        name_stripped = name.strip()
+        if len(name_stripped) < 5:
             return False
         
-        # Список недопустимых паттернов в названиях
-        invalid_patterns = [
-            r'ещё\s*фото',
-            r'первичная\s*продажа',
-            r'продажа',
-            r'фото',
-            r'подробнее',
-            r'читать\s*далее',
-            r'смотреть',
-            r'клик',
-            r'нажмите',
-            r'подробности',
-            r'^\d+$',  # Только цифры
-            r'^[а-яё]{1,2}$',  # Одна-две буквы
-            r'коттеджные\s*посёлки\s*в\s*',  # Слишком общие названия
-            r'коттеджные\s*поселки\s*в\s*',
-            r'поселки\s*в\s*области',
-            r'коттеджные\s*поселки$',
-        ]
-        
-        name_lower = name.lower().strip()
-        
-        for pattern in invalid_patterns:
-            if re.search(pattern, name_lower, re.I):
-                return False
-        
-        # Проверка на минимальную длину осмысленного названия
-        if len(name.strip()) < 5:
+        name_lower = name_stripped.lower()
+        if name_lower in _GENERIC_NAMES:
             return False
         
-        # Исключаем слишком общие названия (должно быть конкретное название)
-        if name_lower in ['коттеджные посёлки', 'коттеджные поселки', 'поселки', 'кп']:
+        # Недопустимые слова и паттерны в названиях
+        for word in _INVALID_NAME_WORDS:
+            if word in name_lower:
+                return False
+        if _INVALID_NAME_RE.search(name_lower):
             return False
         
         return True
@@ -447,29 +965,9 @@ class VillageParser:
         if not url:
             return False
         
-        # Исключаем ссылки на квартиры и другие объекты
-        invalid_patterns = [
-            r'/sale/flat/',  # Квартиры
-            r'/sale/room/',  # Комнаты
-            r'/sale/commercial/',  # Коммерческая недвижимость
-            r'/sale/garage/',  # Гаражи
-        ]
-        
-        for pattern in invalid_patterns:
-            if re.search(pattern, url, re.I):
-                return False
-        
-        # Проверяем наличие ключевых слов для поселков
-        village_keywords = [
-            r'kottedzhnye-poselki',
-            r'poselok',
-            r'uchastok',
-            r'cottage',
-        ]
-        
-        for keyword in village_keywords:
-            if re.search(keyword, url, re.I):
-                return True
+        # Исключаем ссылки на квартиры, комнаты, коммерческую недвижимость и гаражи
+        if _NON_VILLAGE_URL_RE.search(url):
+            return False
         
         return True  # По умолчанию считаем валидным, если нет явных признаков квартиры
     
@@ -486,71 +984,24 @@ class VillageParser:
                 f"https://www.cian.ru/cat.php?deal_type=sale&object_type%5B0%5D=2&region={region}",
             ]
             base_url = base_urls[0]  # Используем первый вариант
-            
-            for page in range(1, max_pages + 1):
-                self.delay()
-                if page == 1:
-                    url = base_url
-                else:
-                    url = f"{base_url}?p={page}"
-                
+            page_urls = {page: base_url if page == 1 else f"{base_url}?p={page}" for page in range(1, max_pages + 1)}
+            
+            # Страницы загружаются параллельно в нескольких потоках (ожидание сети
+            # перекрывается) и сразу разбираются BeautifulSoup в отдельных процессах
+            # (разбор упирается в CPU и GIL); результаты обрабатываются по порядку
+            # в основном потоке — village_id и Selenium трогает только он.
+            # Процессы запускаются через spawn: fork из процесса с работающими
+            # потоками загрузки может унаследовать захваченные ими блокировки
+            with ProcessPoolExecutor(max_workers=PAGE_PARSE_WORKERS,
+                                     mp_context=multiprocessing.get_context('spawn')) as parse_pool:
+                executor = ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS)
+                futures = {page: executor.submit(self._fetch_and_parse_cian_page, url, parse_pool)
+                           for page, url in page_urls.items()}
                 try:
-                    response = self.session.get(url, timeout=30)
-                    response.raise_for_status()
-                    
-                    soup = BeautifulSoup(response.text, 'html.parser')
-                    
-                    # Улучшенный поиск карточек поселков
-                    # Используем несколько стратегий поиска
-                    cards = []
-                    
-                    # Стратегия 1: Поиск по data-атрибутам
-                    cards.extend(soup.find_all(attrs={'data-name': re.compile(r'Card|Offer', re.I)}))
-                    
-                    # Стратегия 2: Поиск по классам с ключевыми словами
-                    cards.extend(soup.find_all(['article', 'div'], class_=re.compile(r'card|item|village|offer|lot', re.I)))
-                    
-                    # Стратегия 3: Поиск ссылок на поселки
-                    links = soup.find_all('a', href=re.compile(r'kottedzhnye-poselki|poselok|uchastok', re.I))
-                    for link in links:
-                        parent = link.find_parent(['article', 'div'])
-                        if parent and parent not in cards:
-                            cards.append(parent)
-                    
-                    # Удаляем дубликаты
-                    seen = set()
-                    unique_cards = []
-                    for card in cards:
-                        card_id = id(card)
-                        if card_id not in seen:
-                            seen.add(card_id)
-                            unique_cards.append(card)
-                    
-                    if not unique_cards:
-                        logger.warning(f"Не найдено карточек на странице {page}, пробуем альтернативный метод...")
-                        # Альтернативный метод: поиск всех ссылок на поселки
-                        all_links = soup.find_all('a', href=re.compile(r'kottedzhnye-poselki', re.I))
-                        if not all_links:
-                            logger.warning(f"Не найдено ссылок на поселки на странице {page}")
-                            break
-                    
-                    valid_count = 0
-                    for card in unique_cards:
-                        village_data = self._parse_cian_card(card, url)
-                        if village_data and self.validate_village_name(village_data.get('Название поселка', '')):
-                            villages.append(village_data)
-                            valid_count += 1
-                    
-                    logger.info(f"Обработано страниц: {page}/{max_pages}, найдено карточек: {len(unique_cards)}, валидных поселков: {valid_count}, всего: {len(villages)}")
-                    
-                    # Если на странице нет валидных данных, прекращаем парсинг
-                    if valid_count == 0 and page > 1:
-                        logger.info(f"На странице {page} нет валидных данных, прекращаем парсинг")
-                        break
-                    
-                except Exception as e:
-                    logger.error(f"Ошибка при парсинге страницы {page} Cian.ru: {e}")
-                    continue
+                    self._parse_cian_pages(futures, max_pages, villages)
+                finally:
+                    # Ещё не начатые загрузки после последней разобранной страницы не нужны
+                    executor.shutdown(wait=True, cancel_futures=True)
             
         except Exception as e:
             logger.error(f"Ошибка при парсинге Cian.ru: {e}")
@@ -558,59 +1009,108 @@ class VillageParser:
         logger.info(f"Всего найдено валидных поселков на Cian.ru: {len(villages)}")
         return villages
     
+    def _fetch_and_parse_cian_page(self, url: str, parse_pool: ProcessPoolExecutor) -> Tuple[int, List[Dict], bool]:
+        """Загрузка страницы каталога Cian.ru и её разбор в процессе пула (выполняется в потоке загрузки)"""
+        html = self._fetch_page(url)
+        return parse_pool.submit(_parse_cian_page, html, url, self.current_date).result()
+    
+    def _parse_cian_pages(self, futures: Dict, max_pages: int, villages: List[Dict]):
+        """Обработка разобранных страниц Cian.ru по порядку"""
+        for page in range(1, max_pages + 1):
+            try:
+                # Результат страницы не держим в futures до конца обработки всего каталога
+                cards_count, page_villages, has_catalog_links = futures.pop(page).result()
+                
+                if not cards_count:
+                    logger.warning(f"Не найдено карточек на странице {page}, пробуем альтернативный метод...")
+                    # Альтернативный метод: поиск всех ссылок на поселки
+                    if not has_catalog_links:
+                        logger.warning(f"Не найдено ссылок на поселки на странице {page}")
+                        break
+                
+                # ID назначаются здесь: в процессах разбора счётчика village_id нет
+                for village_data in page_villages:
+                    village_data['ID'] = self.village_id
+                    self.village_id += 1
+                valid_count = len(page_villages)
+                
+                # Телефоны, которых нет в карточках, — со страниц поселков сразу для всей страницы каталога
+                self._fill_phones_with_selenium(page_villages)
+                villages.extend(page_villages)
+                
+                logger.info(f"Обработано страниц: {page}/{max_pages}, найдено карточек: {cards_count}, валидных поселков: {valid_count}, всего: {len(villages)}")
+                
+                # Если на странице нет валидных данных, прекращаем парсинг
+                if valid_count == 0 and page > 1:
+                    logger.info(f"На странице {page} нет валидных данных, прекращаем парсинг")
+                    break
+                
+            except Exception as e:
+                logger.error(f"Ошибка при парсинге страницы {page} Cian.ru: {e}")
+                continue
+    
+    def _parse_cian_html(self, html: bytes, url: str) -> Tuple[int, List[Dict], bool]:
+        """
+        Разбор HTML страницы каталога Cian.ru
+        
+        Returns:
+            Число найденных карточек, валидные поселки и есть ли на странице
+            ссылки на каталог поселков
+        """
+        soup = BeautifulSoup(html, HTML_PARSER, parse_only=CIAN_CATALOG_STRAINER)
+        
+        # Улучшенный поиск карточек поселков
+        # Используем несколько стратегий поиска (кандидаты всех стратегий
+        # собираются за один обход страницы)
+        by_attr, by_class, links = _scan_cian_catalog(soup)
+        
+        # Дубликаты (один и тот же элемент из разных стратегий) отсекаются
+        # сразу при сборе, без отдельного прохода по списку
+        unique_cards = []
+        seen = set()
+        
+        # Стратегия 1: Поиск по data-атрибутам
+        # Стратегия 2: Поиск по классам с ключевыми словами
+        for card in by_attr + by_class:
+            if id(card) not in seen:
+                seen.add(id(card))
+                unique_cards.append(card)
+        
+        # Стратегия 3: Поиск ссылок на поселки
+        for link in links:
+            parent = link.find_parent(['article', 'div'])
+            # Уже собранный элемент отсекается по id без сравнения со всем списком;
+            # равную ему по содержимому карточку (parent in unique_cards) — как раньше
+            if parent and id(parent) not in seen and parent not in unique_cards:
+                seen.add(id(parent))
+                unique_cards.append(parent)
+        
+        has_catalog_links = bool(unique_cards) or any(_CIAN_CATALOG_HREF_RE.search(link['href']) for link in links)
+        
+        page_villages = []
+        for card in unique_cards:
+            village_data = self._parse_cian_card(card, url)
+            if village_data and self.validate_village_name(village_data.get('Название поселка', '')):
+                page_villages.append(village_data)
+        
+        return len(unique_cards), page_villages, has_catalog_links
+    
     def _parse_cian_card(self, card, source_url: str) -> Optional[Dict]:
         """Парсинг карточки поселка с Cian.ru"""
         try:
-            village = {
-                'ID': self.village_id,
-                'Название поселка': None,
-                'Регион': None,
-                'Город/Район': None,
-                'Адрес': None,
-                'Координаты': None,
-                'Ссылка на источник': None,
-                'Количество домов/участков': None,
-                'Статус поселка': None,
-                'Наличие ограждения': None,
-                'Наличие КПП': None,
-                'Количество КПП': None,
-                'Наличие охраны': None,
-                'Тип охраны': None,
-                'Наличие интернета': None,
-                'Тип управления': None,
-                'Название УК/ТСЖ': None,
-                'ФИО председателя/руководителя': None,
-                'Телефон основной': None,
-                'Телефон дополнительный': None,
-                'Email': None,
-                'Сайт поселка/УК': None,
-                'Социальные сети': None,
-                'Challenges (Проблемы)': None,
-                'Authority (Полномочия)': 'Неизвестно',
-                'Money (Бюджет)': 'Неизвестно',
-                'Priority (Приоритет)': 'Неизвестно',
-                'Оценка целевого клиента': 'Требует проверки',
-                'Статус в CRM': 'Не обработан',
-                'ID сделки в CRM': None,
-                'Менеджер': None,
-                'Дата первого контакта': None,
-                'Дата последнего контакта': None,
-                'Следующий контакт': None,
-                'Комментарии': None,
-                'Результат': 'Не обработан',
-                'Дата продажи': None,
-                'Сумма сделки': None,
-                'Причина отказа': None,
-                'Источник информации': 'Cian.ru',
-                'Дата добавления в базу': self.current_date,
-                'Дата последнего обновления': self.current_date,
-                'Кто добавил': 'Парсер'
-            }
+            village = _EMPTY_CIAN_VILLAGE.copy()
+            village['ID'] = self.village_id
+            village['Дата добавления в базу'] = self.current_date
+            village['Дата последнего обновления'] = self.current_date
             
             card_text = card.get_text()
+            # Без цифр в тексте не найдутся ни количество домов, ни телефон
+            has_digits = _DIGITS_RE.search(card_text) is not None
+            # Все элементы, которые ищут стратегии ниже, — за один обход карточки
+            found = _scan_cian_card(card)
             
             # Поиск ссылки на страницу поселка (приоритет ссылкам на поселки)
-            links = card.find_all('a', href=True)
+            links = found['links']
             for link in links:
                 href = link.get('href', '')
                 if 'kottedzhnye-poselki' in href or 'poselok' in href or 'uchastok' in href:
@@ -637,11 +1137,11 @@ class VillageParser:
             
             # Улучшенный поиск названия
             # Стратегия 1: Поиск по data-атрибутам
-            title_elem = card.find(attrs={'data-name': re.compile(r'Title|Name', re.I)})
+            title_elem = found.get('title_attr')
             
             # Стратегия 2: Поиск заголовков
             if not title_elem:
-                title_elem = card.find(['h1', 'h2', 'h3', 'h4'], class_=re.compile(r'title|name|heading', re.I))
+                title_elem = found.get('title_heading')
             
             # Стратегия 3: Поиск в ссылках на поселки
             if not title_elem:
@@ -655,7 +1155,7 @@ class VillageParser:
             # Стратегия 4: Поиск первого значимого текста
             if not title_elem:
                 # Ищем текст, который похож на название поселка
-                text_elements = card.find_all(['a', 'span', 'div'], string=re.compile(r'[А-ЯЁ][а-яё]+.*поселок|поселок.*[А-ЯЁ]', re.I))
+                text_elements = card.find_all(['a', 'span', 'div'], string=_CIAN_TITLE_TEXT_RE)
                 if text_elements:
                     for elem in text_elements:
                         text = elem.get_text(strip=True)
@@ -666,97 +1166,81 @@ class VillageParser:
             if title_elem:
                 title_text = title_elem.get_text(strip=True)
                 # Очистка названия от лишних символов
-                title_text = re.sub(r'\s+', ' ', title_text).strip()
+                title_text = _WHITESPACE_RE.sub(' ', title_text).strip()
                 village['Название поселка'] = title_text
             
             # Улучшенный поиск адреса
             # Стратегия 1: Поиск по data-атрибутам
-            address_elem = card.find(attrs={'data-name': re.compile(r'Address|Location|Geo', re.I)})
+            address_elem = found.get('address_attr')
             
             # Стратегия 2: Поиск по классам
             if not address_elem:
-                address_elem = card.find(['div', 'span'], class_=re.compile(r'address|location|geo|region', re.I))
+                address_elem = found.get('address_class')
             
             # Стратегия 3: Поиск по тексту с ключевыми словами
             if not address_elem:
-                address_patterns = [
-                    r'[А-ЯЁ][а-яё]+\s*(?:область|край|район)',
-                    r'[А-ЯЁ][а-яё]+\s*шоссе',
-                    r'\d+\s*км\s*до\s*МКАД',
-                ]
-                for pattern in address_patterns:
-                    matches = card.find_all(string=re.compile(pattern, re.I))
-                    if matches:
-                        address_elem = matches[0].parent if hasattr(matches[0], 'parent') else None
-                        break
+                match = _first_string_match(card, _CIAN_ADDRESS_TEXT_RES)
+                if match is not None:
+                    address_elem = match.parent if hasattr(match, 'parent') else None
             
             if address_elem:
                 address_text = address_elem.get_text(strip=True)
                 village['Адрес'] = address_text
                 
                 # Извлечение региона из адреса
-                if 'область' in address_text.lower() or 'край' in address_text.lower():
-                    parts = re.split(r'[,;]', address_text)
+                address_lower = address_text.lower()
+                if 'область' in address_lower or 'край' in address_lower:
+                    parts = _ADDRESS_SPLIT_RE.split(address_text)
                     for part in parts:
                         part = part.strip()
-                        if 'область' in part.lower() or 'край' in part.lower():
+                        part_lower = part.lower()
+                        if 'область' in part_lower or 'край' in part_lower:
                             village['Регион'] = part
                         elif part and not village.get('Город/Район'):
                             village['Город/Район'] = part
             
             # Улучшенный поиск количества домов/участков
             # Ищем паттерны типа "120 домов", "50 участков", "коттеджей: 80"
-            houses_patterns = [
-                r'(\d+)\s*(?:дом|участк|коттедж|лот)',
-                r'(?:дом|участк|коттедж|лот)[а-яё]*[:\s]+(\d+)',
-                r'(\d+)\s*в\s*продаже',
-            ]
-            
-            for pattern in houses_patterns:
-                matches = re.findall(pattern, card_text, re.I)
-                if matches:
+            for pattern in _HOUSES_RES if has_digits else ():
+                match = pattern.search(card_text)
+                if match:
                     try:
-                        houses_num = int(matches[0])
+                        houses_num = int(match.group(1))
                         if 10 <= houses_num <= 10000:  # Разумные пределы
                             village['Количество домов/участков'] = houses_num
                             break
                     except (ValueError, IndexError):
                         continue
             
-            # Поиск информации о статусе поселка
-            status_keywords = {
-                'построен': 'Построен и заселен',
-                'заселен': 'Построен и заселен',
-                'сдача': 'В строительстве (>80%)',
-                'строительств': 'В строительстве (>80%)',
-            }
+            flags = {m.lastgroup for m in _CARD_FLAGS_RE.finditer(card_text)}
             
-            for keyword, status in status_keywords.items():
-                if re.search(keyword, card_text, re.I):
-                    village['Статус поселка'] = status
-                    break
+            # Поиск информации о статусе поселка
+            if 'built' in flags:
+                village['Статус поселка'] = 'Построен и заселен'
+            elif 'building' in flags:
+                village['Статус поселка'] = 'В строительстве (>80%)'
             
             # Поиск информации об инфраструктуре
-            if re.search(r'огражден|забор|периметр', card_text, re.I):
+            if 'fence' in flags:
                 village['Наличие ограждения'] = 'Да'
             
-            if re.search(r'кпп|контрольно-пропускной|пропускной\s*пункт', card_text, re.I):
+            if 'kpp' in flags:
                 village['Наличие КПП'] = 'Да'
                 # Попытка найти количество КПП
-                kpp_match = re.search(r'(\d+)\s*кпп', card_text, re.I)
+                kpp_match = _KPP_COUNT_RE.search(card_text) if has_digits else None
                 if kpp_match:
                     village['Количество КПП'] = int(kpp_match.group(1))
             
-            if re.search(r'охрана|чоп|охраняем', card_text, re.I):
+            if 'security' in flags or 'chop' in flags:
                 village['Наличие охраны'] = 'Да'
-                if 'чоп' in card_text.lower():
+                if 'chop' in flags:
                     village['Тип охраны'] = 'ЧОП'
             
             # Поиск телефона
             # Сначала пробуем стандартные методы парсинга
-            phone_elem = card.find(['a', 'span', 'button'], href=re.compile(r'tel:', re.I))
+            phone_elem = found.get('tel')
             if not phone_elem:
-                phone_elem = card.find(['a', 'span', 'button'], class_=re.compile(r'phone|tel|show.*phone', re.I))
+                phone_elem = found.get('phone_class')
             
             if phone_elem:
                 href = phone_elem.get('href', '')
@@ -770,34 +1254,24 @@ class VillageParser:
                         village['Телефон основной'] = phone
             
             # Поиск телефона в тексте карточки
-            if not village.get('Телефон основной'):
+            if not village.get('Телефон основной') and has_digits:
                 phone = self.extract_phone(card_text)
                 if phone:
                     village['Телефон основной'] = phone
             
-            # Если телефон не найден и есть ссылка на детальную страницу, используем Selenium
-            if not village.get('Телефон основной') and village.get('Ссылка на источник') and self.use_selenium and self.selenium_extractor and self._can_do_selenium_phone():
-                try:
-                    logger.debug(f"Попытка получить телефон через Selenium для {village.get('Название поселка')}")
-                    self.delay()
-                    phone = self.selenium_extractor.extract_phone_from_url(village['Ссылка на источник'])
-                    if phone:
-                        village['Телефон основной'] = phone
-                        self.selenium_phones_count += 1
-                        logger.info(f"Телефон получен через Selenium: {phone}")
-                except Exception as e:
-                    logger.debug(f"Ошибка при получении телефона через Selenium: {e}")
+            # Если телефон не найден, он запрашивается через Selenium со страницы
+            # поселка — пачкой для всей страницы каталога (см. _parse_cian_pages)
             
             # Поиск email
-            email_elem = card.find('a', href=re.compile(r'mailto:', re.I))
+            email_elem = found.get('mailto')
             if email_elem:
                 email = email_elem.get('href', '').replace('mailto:', '').strip()
                 # Исключаем служебные email
-                if 'cian.ru' not in email.lower() and 'support' not in email.lower():
+                if not _is_service_email(email):
                     village['Email'] = email
             else:
-                email = self.extract_email(card_text)
-                if email and 'cian.ru' not in email.lower() and 'support' not in email.lower():
+                email = self.extract_email(card_text) if '@' in card_text else None
+                if email and not _is_service_email(email):
                     village['Email'] = email
             
             # Валидация данных перед возвратом
@@ -851,10 +1325,11 @@ class VillageParser:
                     time.sleep(2)
                     
                     page_source = driver.page_source
-                    soup = BeautifulSoup(page_source, 'html.parser')
+                    soup = BeautifulSoup(page_source, HTML_PARSER)
                     
                     # Проверяем на авторизацию
-                    if 'войти' in page_source.lower() or 'авторизация' in page_source.lower():
+                    page_lower = page_source.lower()
+                    if 'войти' in page_lower or 'авторизация' in page_lower:
                         logger.warning(f"Требуется авторизация на DomClick.ru для страницы {page}")
                         break
                     
@@ -1018,6 +1493,10 @@ class VillageParser:
             logger.warning("Для парсинга Яндекс.Недвижимость требуется Selenium")
             return villages
         
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions as EC
+        from selenium.webdriver.support.ui import WebDriverWait
+        
         try:
             # Яндекс.Недвижимость использует динамический контент, нужен Selenium
             # Используем страницу с коттеджными поселками, а не отдельными участками
@@ -1054,7 +1533,7 @@ class VillageParser:
                     
                     # Получаем HTML после загрузки
                     page_source = driver.page_source
-                    soup = BeautifulSoup(page_source, 'html.parser')
+                    soup = BeautifulSoup(page_source, HTML_PARSER)
                     
                     # Ищем карточки объявлений (разные варианты селекторов для Яндекс.Недвижимость)
                     cards = soup.find_all(['article', 'div'], class_=re.compile(r'OffersSerpItem|offer|item|card|snippet|SerpItem', re.I))
@@ -1279,7 +1758,7 @@ class VillageParser:
                         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
                         time.sleep(2)
                         page_source = driver.page_source
-                        soup = BeautifulSoup(page_source, 'html.parser')
+                        soup = BeautifulSoup(page_source, HTML_PARSER)
                     else:
                         response = self.session.get(url, timeout=60)
                         
@@ -1290,7 +1769,7 @@ class VillageParser:
                             response = self.session.get(url, timeout=60)
                         
                         response.raise_for_status()
-                        soup = BeautifulSoup(response.text, 'html.parser')
+                        soup = BeautifulSoup(response.text, HTML_PARSER)
                     
                     # Ищем карточки поселков
                     cards = soup.find_all(['div', 'article'], class_=re.compile(r'village|poselok|item|card|descr', re.I))
@@ -1477,7 +1956,7 @@ class VillageParser:
                     response = self.session.get(url, timeout=30)
                     response.raise_for_status()
                     
-                    soup = BeautifulSoup(response.text, 'html.parser')
+                    soup = BeautifulSoup(response.text, HTML_PARSER)
                     
                     # Поиск ссылок на поселки (основной метод для Poselki.ru)
                     poselok_links = soup.find_all('a', href=True)
@@ -1718,10 +2197,11 @@ class VillageParser:
                         time.sleep(2)
                         
                         page_source = driver.page_source
-                        soup = BeautifulSoup(page_source, 'html.parser')
+                        soup = BeautifulSoup(page_source, HTML_PARSER)
                         
                         # Проверяем на капчу
-                        if 'captcha' in page_source.lower() or 'доступ ограничен' in page_source.lower():
+                        page_lower = page_source.lower()
+                        if 'captcha' in page_lower or 'доступ ограничен' in page_lower:
                             logger.warning(f"Обнаружена капча или блокировка на странице {page} Авито")
                             break
                     else:
@@ -1737,10 +2217,11 @@ class VillageParser:
                             continue
                         
                         response.raise_for_status()
-                        soup = BeautifulSoup(response.text, 'html.parser')
+                        soup = BeautifulSoup(response.text, HTML_PARSER)
                         
                         # Проверяем на страницу с капчей или блокировкой
-                        if 'captcha' in response.text.lower() or 'доступ ограничен' in response.text.lower():
+                        page_lower = response.text.lower()
+                        if 'captcha' in page_lower or 'доступ ограничен' in page_lower:
                             logger.warning(f"Обнаружена капча или блокировка на странице {page} Авито")
                             break
                     
@@ -1923,32 +2404,34 @@ class VillageParser:
             logger.error(f"Ошибка при парсинге карточки Авито: {e}")
             return None
     
-    def enrich_village_data(self, village: Dict) -> Dict:
-        """Дополнение данных о поселке из детальной страницы"""
+    def enrich_village_data(self, village: Dict, selenium_fallback: bool = True) -> Dict:
+        """
+        Дополнение данных о поселке из детальной страницы
+        
+        Args:
+            village: Запись поселка (дополняется на месте)
+            selenium_fallback: Искать телефон через Selenium, если на странице его нет
+                (run() отключает это и получает телефоны пачкой через пул браузеров)
+        """
         if not village.get('Ссылка на источник'):
             return village
         
         try:
             self.delay()
-            response = self.session.get(village['Ссылка на источник'], timeout=(10, 25))  # (connect, read)
+            # Не больше PAGE_FETCH_CONCURRENCY одновременных запросов к сайту
+            with self._page_semaphore:
+                response = self.session.get(village['Ссылка на источник'], timeout=(10, 25))  # (connect, read)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.text, 'html.parser')
+            soup = BeautifulSoup(response.text, HTML_PARSER)
             
             # Поиск дополнительной информации на странице
             page_text = soup.get_text()
             
             # Улучшенный поиск количества домов/участков
             if not village.get('Количество домов/участков'):
-                houses_patterns = [
-                    r'(\d+)\s*(?:дом|участк|коттедж|лот)\s*в\s*продаже',
-                    r'в\s*продаже\s*(\d+)\s*(?:дом|участк|коттедж|лот)',
-                    r'(\d+)\s*(?:дом|участк|коттедж|лот)',
-                    r'количество[:\s]+(\d+)',
-                ]
-                
-                for pattern in houses_patterns:
-                    match = re.search(pattern, page_text, re.I)
+                for pattern in _PAGE_HOUSES_RES:
+                    match = pattern.search(page_text)
                     if match:
                         try:
                             houses_num = int(match.group(1))
@@ -1958,23 +2441,37 @@ class VillageParser:
                         except (ValueError, IndexError):
                             continue
             
+            # Все признаки ищутся одним проходом; проход прекращается, как только
+            # решены вопросы по полям, которые ещё не заполнены
+            needed = {'internet'}
+            if not village.get('Наличие ограждения'):
+                needed.add('fence')
+            if not village.get('Наличие КПП'):
+                needed.add('kpp')
+            if not village.get('Наличие охраны'):
+                needed.update(('security', 'security_type'))
+            if not village.get('Статус поселка'):
+                needed.add('status')
+            flags = set()
+            for m in _PAGE_FLAGS_RE.finditer(page_text):
+                flags.add(m.lastgroup)
+                needed.difference_update(_PAGE_FLAG_DECIDES[m.lastgroup])
+                if not needed:
+                    break
+            
             # Улучшенный поиск информации об ограждении
             if not village.get('Наличие ограждения'):
-                if re.search(r'огражден|забор|периметр|ограждение|защищен', page_text, re.I):
+                if 'fence' in flags:
                     village['Наличие ограждения'] = 'Да'
             
             # Улучшенный поиск информации о КПП
             if not village.get('Наличие КПП'):
-                if re.search(r'кпп|контрольно-пропускной|пропускной\s*пункт|контроль\s*доступа', page_text, re.I):
+                if 'kpp' in flags:
                     village['Наличие КПП'] = 'Да'
                     
                     # Поиск количества КПП
-                    kpp_patterns = [
-                        r'(\d+)\s*кпп',
-                        r'кпп[:\s]+(\d+)',
-                    ]
-                    for pattern in kpp_patterns:
-                        match = re.search(pattern, page_text, re.I)
+                    for pattern in _PAGE_KPP_COUNT_RES:
+                        match = pattern.search(page_text)
                         if match:
                             try:
                                 village['Количество КПП'] = int(match.group(1))
@@ -1984,30 +2481,30 @@ class VillageParser:
             
             # Улучшенный поиск информации об охране
             if not village.get('Наличие охраны'):
-                if re.search(r'охрана|чоп|охраняем|безопасность|сторож', page_text, re.I):
+                if 'security' in flags or 'chop' in flags:
                     village['Наличие охраны'] = 'Да'
                     
                     # Определение типа охраны
-                    if re.search(r'чоп|частн.*охранн', page_text, re.I):
+                    if 'chop' in flags or 'private' in flags:
                         village['Тип охраны'] = 'ЧОП'
-                    elif re.search(r'собственн.*охрана|внутренн.*охрана', page_text, re.I):
+                    elif 'own_security' in flags:
                         village['Тип охраны'] = 'Собственная охрана'
             
             # Поиск информации о статусе поселка
             if not village.get('Статус поселка'):
-                if re.search(r'построен|заселен|сдан|эксплуат', page_text, re.I):
+                if 'built' in flags:
                     village['Статус поселка'] = 'Построен и заселен'
-                elif re.search(r'сдача\s*в\s*\d{4}|строительств|возводится', page_text, re.I):
+                elif 'building' in flags:
                     village['Статус поселка'] = 'В строительстве (>80%)'
             
             # Поиск информации об интернете
-            if re.search(r'интернет|wi-fi|wifi|подключен.*интернет', page_text, re.I):
+            if 'internet' in flags:
                 village['Наличие интернета'] = 'Да'
             
             # Улучшенный поиск телефона
             if not village.get('Телефон основной'):
                 # Поиск в специальных блоках
-                phone_blocks = soup.find_all(['div', 'span'], class_=re.compile(r'phone|contact|tel', re.I))
+                phone_blocks = soup.find_all(['div', 'span'], class_=_PAGE_PHONE_CLASS_RE)
                 for block in phone_blocks:
                     phone = self.extract_phone(block.get_text())
                     if phone:
@@ -2021,7 +2518,8 @@ class VillageParser:
                         village['Телефон основной'] = phone
                 
                 # Если телефон все еще не найден, используем Selenium
-                if not village.get('Телефон основной') and self.use_selenium and self.selenium_extractor and self._can_do_selenium_phone():
+                if (selenium_fallback and not village.get('Телефон основной') and self.use_selenium
+                        and self.selenium_extractor and self._can_do_selenium_phone()):
                     try:
                         logger.debug(f"Попытка получить телефон через Selenium для {village.get('Название поселка')}")
                         self.delay()
@@ -2035,41 +2533,35 @@ class VillageParser:
             
             # Улучшенный поиск email
             if not village.get('Email'):
-                email_blocks = soup.find_all(['a', 'span'], class_=re.compile(r'email|mail|contact', re.I))
+                email_blocks = soup.find_all(['a', 'span'], class_=_PAGE_EMAIL_CLASS_RE)
                 for block in email_blocks:
                     email = self.extract_email(block.get_text())
-                    if email and 'cian.ru' not in email.lower() and 'support' not in email.lower():
+                    if email and not _is_service_email(email):
                         village['Email'] = email
                         break
                 
                 # Если не нашли в блоках, ищем в тексте
                 if not village.get('Email'):
                     email = self.extract_email(page_text)
-                    if email and 'cian.ru' not in email.lower() and 'support' not in email.lower():
+                    if email and not _is_service_email(email):
                         village['Email'] = email
             
             # Поиск сайта поселка/УК
             if not village.get('Сайт поселка/УК'):
                 # Ищем ссылки на внешние сайты
-                external_links = soup.find_all('a', href=re.compile(r'^https?://', re.I))
+                external_links = soup.find_all('a', href=_EXTERNAL_HREF_RE)
                 for link in external_links:
                     href = link.get('href', '')
                     # Исключаем ссылки на соцсети и агрегаторы
-                    excluded_domains = ['cian.ru', 'domclick.ru', 'yandex.ru', 'google.com', 
-                                       'vk.com', 'facebook.com', 'instagram.com', 'ok.ru']
-                    if not any(domain in href.lower() for domain in excluded_domains):
+                    href_lower = href.lower()
+                    if not any(domain in href_lower for domain in _EXCLUDED_SITE_DOMAINS):
                         village['Сайт поселка/УК'] = href
                         break
             
             # Поиск названия УК/ТСЖ
             if not village.get('Название УК/ТСЖ'):
-                uk_patterns = [
-                    r'управляющ.*компани[яи]?[:\s]+([А-ЯЁ][А-Яа-яё\s«»""]+)',
-                    r'ук[:\s]+([А-ЯЁ][А-Яа-яё\s«»""]+)',
-                    r'тсж[:\s]+([А-ЯЁ][А-Яа-яё\s«»""]+)',
-                ]
-                for pattern in uk_patterns:
-                    match = re.search(pattern, page_text, re.I)
+                for pattern in _UK_NAME_RES:
+                    match = pattern.search(page_text)
                     if match:
                         uk_name = match.group(1).strip()
                         if len(uk_name) > 3:
@@ -2195,24 +2687,13 @@ class VillageParser:
                     village['ID'] = village_id
                 
                 # Создаем ключ для дедупликации
-                name = village.get('Название поселка', '').lower().strip()
-                address = village.get('Адрес', '').lower().strip() if village.get('Адрес') else ''
-                name_normalized = re.sub(r'[^\w\s]', '', name)
-                name_normalized = re.sub(r'\s+', ' ', name_normalized).strip()
-                
-                key = (name_normalized, address) if address else (name_normalized,)
+                key = _dedup_key(village)
                 
                 # Если запись с таким ключом уже есть, выбираем более полную
                 if key in unique_results:
                     existing = unique_results[key]
-                    # Подсчитываем полноту данных
-                    existing_score = sum(1 for f in ['Адрес', 'Телефон основной', 'Email', 'Количество домов/участков', 'Ссылка на источник'] 
-                                       if existing.get(f))
-                    village_score = sum(1 for f in ['Адрес', 'Телефон основной', 'Email', 'Количество домов/участков', 'Ссылка на источник'] 
-                                      if village.get(f))
-                    
                     # Если новая запись более полная, заменяем
-                    if village_score > existing_score:
+                    if _completeness(village, _SAVE_SCORE_FIELDS) > _completeness(existing, _SAVE_SCORE_FIELDS):
                         unique_results[key] = village
                     else:
                         # Иначе объединяем данные (заполняем пустые поля)
@@ -2222,25 +2703,23 @@ class VillageParser:
                 else:
                     unique_results[key] = village
             
-            # Сохраняем все уникальные результаты
-            with open(filename, 'w', newline='', encoding='utf-8-sig') as f:
-                writer = csv.DictWriter(f, fieldnames=FIELDS, extrasaction='ignore')
-                writer.writeheader()
-                
-                # Сортируем по ID для сохранения порядка
-                def get_id(v):
-                    try:
-                        id_val = v.get('ID', 0)
-                        if isinstance(id_val, str):
-                            return int(id_val) if id_val.isdigit() else 0
-                        return int(id_val) if id_val else 0
-                    except:
-                        return 0
-                
-                sorted_results = sorted(unique_results.values(), key=get_id)
-                
-                for village in sorted_results:
-                    writer.writerow(village)
+            # Сортируем по ID для сохранения порядка
+            def get_id(v):
+                try:
+                    id_val = v.get('ID', 0)
+                    if isinstance(id_val, str):
+                        return int(id_val) if id_val.isdigit() else 0
+                    return int(id_val) if id_val else 0
+                except:
+                    return 0
+            
+            sorted_results = sorted(unique_results.values(), key=get_id)
+            
+            # Сохраняем все уникальные результаты: одним writerows через крупный буфер
+            with open(filename, 'w', newline='', encoding='utf-8-sig', buffering=CSV_BUFFER_SIZE) as f:
+                writer = csv.writer(f)
+                writer.writerow(FIELDS)
+                writer.writerows(map(_row_values, sorted_results))
             
             new_count = len(self.results)
             total_count = len(unique_results)
@@ -2331,40 +2810,19 @@ class VillageParser:
         # Удаление дубликатов по названию и адресу
         unique_villages = {}
         for village in validated_villages:
-            # Нормализация названия для сравнения
-            name = village.get('Название поселка', '').lower().strip()
-            
-            # Очистка названия от лишних символов для сравнения
-            name_normalized = re.sub(r'[^\w\s]', '', name)
-            name_normalized = re.sub(r'\s+', ' ', name_normalized).strip()
+            # Ключ — нормализованное название и адрес (только название, если адреса нет)
+            key = _dedup_key(village)
             
-            address = village.get('Адрес', '').lower().strip() if village.get('Адрес') else ''
-            
-            # Извлекаем URL для дополнительной проверки
-            url = village.get('Ссылка на источник', '')
-            
-            # Создаем ключ для дедупликации (используем нормализованное название)
-            key = (name_normalized, address)
-            
-            # Альтернативный ключ только по названию (если адреса нет)
-            if not address:
-                key = (name_normalized,)
-            
-            if name_normalized:  # Только если есть название
+            if key[0]:  # Только если есть название
                 if key not in unique_villages:
                     unique_villages[key] = village
                 else:
                     # Объединение данных из разных источников
                     existing = unique_villages[key]
                     
-                    # Выбираем запись с более полными данными
-                    existing_score = sum(1 for f in ['Адрес', 'Телефон основной', 'Email', 'Количество домов/участков'] 
-                                       if existing.get(f))
-                    village_score = sum(1 for f in ['Адрес', 'Телефон основной', 'Email', 'Количество домов/участков'] 
-                                      if village.get(f))
-                    
-                    # Если новая запись более полная, заменяем
-                    if village_score > existing_score:
+                    # Выбираем запись с более полными данными: оценка считается
+                    # заново, потому что existing мог пополниться при слиянии
+                    if _completeness(village, _DEDUP_SCORE_FIELDS) > _completeness(existing, _DEDUP_SCORE_FIELDS):
                         unique_villages[key] = village
                     else:
                         # Иначе объединяем данные
@@ -2381,24 +2839,26 @@ class VillageParser:
         # Лимит обогащения для защиты от зависаний при большом числе записей
         max_enrich = min(MAX_ENRICH, len(self.results))
         
-        for i, village in enumerate(self.results):
+        to_enrich = []
+        for village in self.results:
             if village.get('Ссылка на источник') and self.is_village_url(village['Ссылка на источник']):
                 # Пропускаем, если телефон уже есть
                 if village.get('Телефон основной'):
                     continue
-                if enriched_count >= max_enrich:
+                if len(to_enrich) >= max_enrich:
                     logger.info(f"Достигнут лимит обогащения ({MAX_ENRICH}). Остальные записи пропущены.")
                     break
-                try:
-                    enriched_village = self.enrich_village_data(village)
-                    # Обновляем запись в списке
-                    self.results[i] = enriched_village
-                    enriched_count += 1
-                    if enriched_count % 5 == 0:
-                        logger.info(f"Обогащено записей: {enriched_count}/{len(self.results)}")
-                except Exception as e:
-                    logger.warning(f"Ошибка при обогащении данных для {village.get('Название поселка')}: {e}")
-                    continue
+                to_enrich.append(village)
+        
+        # Детальные страницы загружаются в нескольких потоках (записи дополняются
+        # на месте); телефоны, которых на страницах не нашлось, — затем пачкой
+        # через пул браузеров
+        with ThreadPoolExecutor(max_workers=ENRICH_WORKERS) as executor:
+            for _ in executor.map(lambda v: self.enrich_village_data(v, selenium_fallback=False), to_enrich):
+                enriched_count += 1
+                if enriched_count % 5 == 0:
+                    logger.info(f"Обогащено записей: {enriched_count}/{len(self.results)}")
+        self._fill_phones_with_selenium(to_enrich)
         
         logger.info(f"Обогащение завершено. Обработано записей: {enriched_count}")
         
@@ -2413,13 +2873,25 @@ class VillageParser:
         logger.info(f"Всего записей с телефонами: {total_phones} из {len(self.results)}")
         
         # Закрываем Selenium WebDriver
-        if self.selenium_extractor:
-            self.selenium_extractor.close()
+        self.close_selenium()
         
         # Сохранение результатов (дополняем существующий файл)
         self.save_results(append=True)
 
 
+# Парсер процесса разбора страниц (создаётся один раз на процесс пула, без Selenium)
+_page_parser = None
+
+
+def _parse_cian_page(html: bytes, url: str, current_date: str) -> Tuple[int, List[Dict], bool]:
+    """Разбор страницы каталога Cian.ru в процессе ProcessPoolExecutor (см. VillageParser._parse_cian_html)"""
+    global _page_parser
+    if _page_parser is None:
+        _page_parser = VillageParser(use_selenium=False)
+    _page_parser.current_date = current_date
+    return _page_parser._parse_cian_html(html, url)
+
+
 def main():
     """Главная функция"""
     import argparse
@@ -2438,6 +2910,8 @@ def main():
                           help='Регионы для парсинга')
     arg_parser.add_argument('--max-pages', type=int, default=3,
                           help='Количество страниц для парсинга с каждого источника')
+    arg_parser.add_argument('--no-cache', action='store_true',
+                          help=f'Не использовать кэш телефонов {PHONE_CACHE_FILE} (все страницы открываются заново)')
     
     args = arg_parser.parse_args()
     
@@ -2452,7 +2926,7 @@ def main():
     else:
         logger.info("Selenium отключен. Телефоны будут извлекаться только из статического HTML")
     
-    parser = VillageParser(use_selenium=use_selenium, selenium_headless=selenium_headless)
+    parser = VillageParser(use_selenium=use_selenium, selenium_headless=selenium_headless, use_cache=not args.no_cache)
     
     # Настройки парсинга
     sources = args.sources
@@ -2463,7 +2937,21 @@ def main():
     logger.info(f"Регионы: {regions}")
     logger.info(f"Максимум страниц: {max_pages}")
     
-    parser.run(sources=sources, regions=regions, max_pages=max_pages)
+    # PID-файл для monitor_parsing.py: проверка процесса без запуска ps
+    try:
+        with open(PID_FILE, 'w') as f:
+            f.write(str(os.getpid()))
+    except OSError as e:
+        logger.debug(f"Не удалось записать PID-файл {PID_FILE}: {e}")
+    try:
+        parser.run(sources=sources, regions=regions, max_pages=max_pages)
+    finally:
+        # Браузеры закрываются и при ошибке в run() (run закрывает их сам при успехе)
+        parser.close_selenium()
+        try:
+            os.remove(PID_FILE)
+        except OSError:
+            pass
 
 
 if __name__ == '__main__':